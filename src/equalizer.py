@@ -1,9 +1,10 @@
 import numpy as np
-import librosa
 import soundfile as sf
+from scipy import signal
 import argparse
+import functools
 import os
-from fft import fft, ifft, fftfreq
+from fft import rfft, irfft, rfftfreq, next_fast_len
 
 
 def calculate_cutoff_frequencies(center_frequencies, sample_rate):
@@ -17,30 +18,25 @@ def calculate_cutoff_frequencies(center_frequencies, sample_rate):
         sample_rate: Taxa de amostragem (Hz)
     
     Returns:
-        Lista de tuplas (low_cutoff, high_cutoff) para cada banda
+        Array (n_bandas, 2) com as frequências (low_cutoff, high_cutoff) de cada
+        banda; cada linha pode ser desempacotada como uma tupla
     """
-    cutoff_freqs = []
-    n_bands = len(center_frequencies)
+    centers = np.asarray(center_frequencies, dtype=np.float64)
+    cutoff_freqs = np.empty((len(centers), 2), dtype=np.float64)
+    if len(centers) == 0:
+        return cutoff_freqs
     
-    for i in range(n_bands):
-        # Calcula a frequência de corte inferior
-        if i == 0:
-            # Primeira banda: corte inferior é 0 Hz ou ponto médio entre 0 e a primeira frequência central
-            # Usamos um valor baixo (ex: 50 Hz) ou podemos usar 0
-            low_cutoff = 0.0
-        else:
-            # Ponto médio entre a frequência central anterior e a atual
-            low_cutoff = (center_frequencies[i-1] + center_frequencies[i]) / 2.0
-        
-        # Calcula a frequência de corte superior
-        if i == n_bands - 1:
-            # Última banda: corte superior é a frequência de Nyquist
-            high_cutoff = sample_rate / 2.0
-        else:
-            # Ponto médio entre a frequência central atual e a próxima
-            high_cutoff = (center_frequencies[i] + center_frequencies[i+1]) / 2.0
-        
-        cutoff_freqs.append((low_cutoff, high_cutoff))
+    # Ponto médio entre cada frequência central e a seguinte: é o corte superior de
+    # uma banda e o corte inferior da próxima
+    midpoints = 0.5 * (centers[:-1] + centers[1:])
+    
+    # Primeira banda: corte inferior é 0 Hz
+    cutoff_freqs[0, 0] = 0.0
+    cutoff_freqs[1:, 0] = midpoints
+    
+    # Última banda: corte superior é a frequência de Nyquist
+    cutoff_freqs[:-1, 1] = midpoints
+    cutoff_freqs[-1, 1] = sample_rate / 2.0
     
     return cutoff_freqs
 
@@ -70,53 +66,42 @@ def create_bandpass_impulse_response(filter_length, sample_rate, low_cutoff, hig
     omega_c1 = 2 * np.pi * low_cutoff / sample_rate
     omega_c2 = 2 * np.pi * high_cutoff / sample_rate
     
-    # Cria índices n centrados em zero: [-M, ..., -1, 0, 1, ..., M]
+    # Índices n centrados em zero: [-M, ..., -1, 0, 1, ..., M]
     M = (filter_length - 1) // 2
-    n = np.arange(-M, M + 1, dtype=np.float64)
-    
-    # Inicializa a resposta ao impulso
-    h = np.zeros(filter_length, dtype=np.float64)
+    h = np.empty(filter_length, dtype=np.float64)
     
     # Caso n = 0
     h[M] = (omega_c2 - omega_c1) / np.pi
     
     # Caso n ≠ 0: usa numpy.sinc
     # sinc(x) = sin(πx) / (πx)
-    # sin(ω_c2 n) / (nπ) = (ω_c2 / π) * sinc(ω_c2 n / π)
-    # sin(ω_c1 n) / (nπ) = (ω_c1 / π) * sinc(ω_c1 n / π)
-    mask = n != 0
-    n_nonzero = n[mask]
-    
-    # Usa sinc para calcular sin(ω n) / (nπ)
     # sin(ω n) / (nπ) = (ω / π) * sinc(ω n / π)
-    h[mask] = (omega_c2 / np.pi) * np.sinc(omega_c2 * n_nonzero / np.pi) - \
-              (omega_c1 / np.pi) * np.sinc(omega_c1 * n_nonzero / np.pi)
+    # A resposta é par (h[-n] = h[n]), então basta calcular n = 1, ..., M e espelhar,
+    # combinando os termos no próprio buffer da metade positiva
+    if M > 0:
+        x = np.arange(1, M + 1, dtype=np.float64) / np.pi
+        h_pos = h[M + 1:]
+        np.multiply(np.sinc(omega_c2 * x), omega_c2 / np.pi, out=h_pos)
+        h_pos -= (omega_c1 / np.pi) * np.sinc(omega_c1 * x)
+        h[:M] = h_pos[::-1]
     
     return h
 
 
-def create_frequency_filter(n_samples, sample_rate, center_freq, bandwidth=50, 
-                           low_cutoff=None, high_cutoff=None, filter_shape='gaussian'):
+def _resolve_band_edges(sample_rate, center_freq, bandwidth, low_cutoff, high_cutoff):
     """
-    Cria um filtro passa-banda no domínio da frequência.
+    Determina as frequências de corte efetivas de um filtro passa-banda.
     
     Args:
-        n_samples: Número de amostras do sinal
         sample_rate: Taxa de amostragem (Hz)
         center_freq: Frequência central do filtro (Hz)
-        bandwidth: Largura de banda do filtro (Hz) - usado apenas se low_cutoff/high_cutoff não fornecidos
-        low_cutoff: Frequência de corte inferior (Hz) - se None, calcula a partir de bandwidth
-        high_cutoff: Frequência de corte superior (Hz) - se None, calcula a partir de bandwidth
-        filter_shape: Forma do filtro ('gaussian' ou 'sinc')
+        bandwidth: Largura de banda (Hz) - usado apenas se low_cutoff/high_cutoff não fornecidos
+        low_cutoff: Frequência de corte inferior (Hz) ou None
+        high_cutoff: Frequência de corte superior (Hz) ou None
     
     Returns:
-        Array com os valores do filtro no domínio da frequência
+        Tupla (low_freq, high_freq, effective_bandwidth)
     """
-    # Calcula as frequências correspondentes a cada bin da FFT
-    freqs = fftfreq(n_samples, 1.0 / sample_rate)
-    freqs = np.abs(freqs)  # Apenas valores positivos
-    
-    # Calcula as frequências de corte
     if low_cutoff is not None and high_cutoff is not None:
         # Usa as frequências de corte fornecidas
         low_freq = max(0, low_cutoff)
@@ -129,77 +114,368 @@ def create_frequency_filter(n_samples, sample_rate, center_freq, bandwidth=50,
         high_freq = min(sample_rate / 2, center_freq + bandwidth / 2)
         effective_bandwidth = bandwidth
     
-    if filter_shape == 'sinc':
-        # Filtro passa-faixa usando resposta ao impulso com sinc
-        # Usa um comprimento de filtro baseado na resolução de frequência desejada
-        # Fórmula: filter_length ≈ 4 * sample_rate / bandwidth (regra de ouro)
-        filter_length = int(4 * sample_rate / max(effective_bandwidth, 1))
-        # Limita o comprimento para não ser muito grande
-        filter_length = min(filter_length, n_samples // 2)
-        # Garante que seja ímpar e pelo menos 3
-        if filter_length % 2 == 0:
-            filter_length += 1
-        filter_length = max(3, filter_length)
+    return low_freq, high_freq, effective_bandwidth
+
+
+def create_bandpass_kernel(n_samples, sample_rate, low_freq, high_freq, bandwidth):
+    """
+    Cria o kernel FIR do filtro passa-faixa (resposta ao impulso sinc com janela Hamming).
+    
+    Args:
+        n_samples: Número de amostras do sinal (limita o comprimento do kernel)
+        sample_rate: Taxa de amostragem (Hz)
+        low_freq: Frequência de corte inferior (Hz)
+        high_freq: Frequência de corte superior (Hz)
+        bandwidth: Largura de banda efetiva (Hz), usada para dimensionar o kernel
+    
+    Returns:
+        Array com a resposta ao impulso janelada (comprimento ímpar, centrada em M)
+    """
+    # Usa um comprimento de filtro baseado na resolução de frequência desejada
+    # Fórmula: filter_length ≈ 4 * sample_rate / bandwidth (regra de ouro)
+    filter_length = int(4 * sample_rate / max(bandwidth, 1))
+    # Limita o comprimento para não ser muito grande
+    filter_length = min(filter_length, n_samples // 2)
+    # Garante que seja ímpar e pelo menos 3
+    if filter_length % 2 == 0:
+        filter_length += 1
+    filter_length = max(3, filter_length)
+    
+    # Cria a resposta ao impulso
+    h = create_bandpass_impulse_response(filter_length, sample_rate, low_freq, high_freq)
+    
+    # Aplica uma janela (Hamming) para reduzir ringing (no próprio array)
+    h *= np.hamming(filter_length)
+    return h
+
+
+# Kernels de até este comprimento são aplicados por convolução direta (np.convolve,
+# em C) em vez de FFT: medido com sinais de 10^6 amostras, a convolução direta é
+# mais rápida que o overlap-save com esta FFT até por volta de 512-1000 coeficientes
+_DIRECT_CONV_MAX_TAPS = 512
+
+# Tamanho dos blocos lidos por vez na convolução direta
+_DIRECT_CONV_BLOCK_SIZE = 65536
+
+
+def overlap_save_blocks(audio, h, fft_size=None):
+    """
+    Filtra o sinal com um kernel FIR usando overlap-save, bloco a bloco.
+    
+    Em vez de uma única FFT do tamanho do arquivo inteiro, o sinal é processado em
+    blocos de fft_size amostras que se sobrepõem em len(h) - 1 amostras. O espectro
+    do kernel é calculado uma única vez e reutilizado em todos os blocos, mantendo
+    o conjunto de trabalho de cada FFT pequeno.
+    
+    O kernel é tratado como de fase zero (centrado em len(h) // 2), então a saída
+    fica alinhada com a entrada.
+    
+    Args:
+        audio: Array numpy com o sinal de áudio (1D ou (canais, amostras))
+        h: Resposta ao impulso do filtro (comprimento ímpar)
+        fft_size: Tamanho da FFT de cada bloco (padrão: potência de 2 >= 4 * len(h))
+    
+    Yields:
+        Blocos consecutivos do áudio filtrado (último eixo = amostras)
+    """
+    audio = np.asarray(audio)
+    n_samples = audio.shape[-1]
+    position = 0
+    
+    def read_into(buffer):
+        nonlocal position
+        count = min(buffer.shape[-1], n_samples - position)
+        buffer[..., :count] = audio[..., position:position + count]
+        position += count
+        return count
+    
+    dtype = np.result_type(audio.dtype, np.float32)
+    yield from overlap_save_stream(read_into, audio.shape, h, fft_size, dtype)
+
+
+def overlap_save_stream(read_into, shape, h, fft_size=None, dtype=np.float32):
+    """
+    Overlap-save sobre um sinal lido sequencialmente (ex: de um arquivo em disco).
+    
+    Cada bloco reaproveita as últimas len(h) - 1 amostras do bloco anterior e lê
+    apenas as amostras novas, então o sinal nunca precisa estar inteiro em memória.
+    
+    Kernels curtos (até _DIRECT_CONV_MAX_TAPS coeficientes) são aplicados a cada
+    bloco por convolução direta no domínio do tempo (np.convolve), mais rápida que
+    o par de FFTs nesse caso; o resultado é o mesmo.
+    
+    Args:
+        read_into: Função que escreve as próximas amostras do sinal no buffer
+                   recebido (formato (..., m)) e devolve quantas escreveu
+                   (menos que m apenas ao chegar ao fim do sinal)
+        shape: Formato do sinal completo (último eixo = amostras)
+        h: Resposta ao impulso do filtro (comprimento ímpar)
+        fft_size: Tamanho da FFT de cada bloco (padrão: potência de 2 >= 4 * len(h);
+                  na convolução direta, _DIRECT_CONV_BLOCK_SIZE)
+        dtype: Tipo real do processamento (padrão: float32)
+    
+    Yields:
+        Blocos consecutivos do áudio filtrado (último eixo = amostras)
+    """
+    n_samples = shape[-1]
+    n_taps = len(h)
+    delay = n_taps // 2
+    history = n_taps - 1
+    
+    direct = n_taps <= _DIRECT_CONV_MAX_TAPS
+    if fft_size is None:
+        fft_size = _DIRECT_CONV_BLOCK_SIZE if direct else next_fast_len(4 * n_taps)
+    fft_size = max(fft_size, n_taps)
+    # Amostras válidas produzidas por bloco
+    step = fft_size - history
+    
+    # Buffer do bloco atual: começa com n_taps - 1 zeros (histórico inicial) e a
+    # saída da convolução é deslocada em delay amostras
+    segment = np.zeros(tuple(shape[:-1]) + (fft_size,), dtype=dtype)
+    
+    if direct:
+        kernel = np.asarray(h, dtype=dtype)
+    else:
+        # Espectro do kernel, reutilizado por todos os blocos
+        kernel_fft = rfft(np.asarray(h, dtype=dtype), n=fft_size)
+        # Espectro do bloco, reutilizado por todos os blocos (e por todos os canais, que
+        # são transformados juntos ao longo do último eixo)
+        block_fft = np.empty(tuple(shape[:-1]) + (fft_size // 2 + 1,), dtype=kernel_fft.dtype)
+    
+    for out_start in range(0, n_samples + delay, step):
+        # Histórico: as últimas n_taps - 1 amostras do bloco anterior; em seguida lê
+        # as step amostras novas (zeros depois do fim do sinal)
+        if out_start > 0 and history > 0:
+            segment[..., :history] = segment[..., step:]
+        new_samples = segment[..., history:]
+        count = read_into(new_samples)
+        new_samples[..., count:] = 0.0
         
-        # Cria a resposta ao impulso
-        h = create_bandpass_impulse_response(filter_length, sample_rate, low_freq, high_freq)
+        if direct:
+            # Parte 'valid' da convolução linear: exatamente as amostras que o
+            # overlap-save manteria (um canal por vez)
+            block = np.empty(tuple(shape[:-1]) + (step,), dtype=dtype)
+            for row, out_row in zip(segment.reshape(-1, fft_size), block.reshape(-1, step)):
+                out_row[:] = np.convolve(row, kernel, mode='valid')
+        else:
+            rfft(segment, out=block_fft)
+            block_fft *= kernel_fft
+            # Descarta as primeiras n_taps - 1 amostras (contaminadas pela convolução circular)
+            block = irfft(block_fft, n=fft_size)[..., history:]
         
-        # Aplica uma janela (Hamming) para reduzir ringing
-        window = np.hamming(filter_length)
-        h = h * window
+        # Remove o atraso do kernel centrado e o excesso após o fim do sinal
+        first = max(delay - out_start, 0)
+        last = min(step, delay + n_samples - out_start)
+        if last > first:
+            yield block[..., first:last]
+
+
+def overlap_save_filter(audio, h, fft_size=None):
+    """
+    Filtra o sinal inteiro com um kernel FIR usando overlap-save.
+    
+    Args:
+        audio: Array numpy com o sinal de áudio (1D ou (canais, amostras))
+        h: Resposta ao impulso do filtro (comprimento ímpar)
+        fft_size: Tamanho da FFT de cada bloco (padrão: potência de 2 >= 4 * len(h))
+    
+    Returns:
+        Áudio filtrado, com o mesmo formato da entrada
+    """
+    return np.concatenate(list(overlap_save_blocks(audio, h, fft_size)), axis=-1)
+
+
+@functools.lru_cache(maxsize=8)
+def _frequency_grid(n_samples, sample_rate):
+    """
+    Retorna as frequências (Hz) dos bins da FFT real, em float32.
+    
+    O resultado é memorizado por (n_samples, sample_rate), já que os filtros de um
+    mesmo sinal são sempre construídos sobre a mesma grade. O array é somente
+    leitura porque é compartilhado entre as chamadas.
+    
+    Args:
+        n_samples: Tamanho da FFT
+        sample_rate: Taxa de amostragem (Hz)
+    
+    Returns:
+        Array com as n_samples // 2 + 1 frequências
+    """
+    freqs = rfftfreq(n_samples, 1.0 / sample_rate).astype(np.float32)
+    freqs.setflags(write=False)
+    return freqs
+
+
+def gaussian_response(freqs, center_freq, sigma, out=None):
+    """
+    Calcula a curva gaussiana exp(-0.5 * ((f - center_freq) / sigma)^2).
+    
+    Todas as etapas (subtração, divisão, quadrado e exponencial) são feitas
+    no mesmo buffer, sem criar arrays temporários intermediários.
+    
+    Args:
+        freqs: Array com as frequências (Hz)
+        center_freq: Frequência central (Hz)
+        sigma: Desvio padrão da gaussiana (Hz)
+        out: Buffer de saída opcional (mesmo formato de freqs)
+    
+    Returns:
+        Array com a resposta gaussiana
+    """
+    out = np.subtract(freqs, center_freq, out=out)
+    out *= 1.0 / sigma
+    np.square(out, out=out)
+    out *= -0.5
+    return np.exp(out, out=out)
+
+
+def create_frequency_filter(n_samples, sample_rate, center_freq, bandwidth=50, 
+                           low_cutoff=None, high_cutoff=None, filter_shape='gaussian'):
+    """
+    Cria um filtro passa-banda no domínio da frequência.
+    
+    O filtro é real e simétrico, então apenas as n_samples // 2 + 1 frequências
+    não negativas (o formato usado por rfft/irfft) são retornadas.
+    
+    Args:
+        n_samples: Número de amostras do sinal
+        sample_rate: Taxa de amostragem (Hz)
+        center_freq: Frequência central do filtro (Hz)
+        bandwidth: Largura de banda do filtro (Hz) - usado apenas se low_cutoff/high_cutoff não fornecidos
+        low_cutoff: Frequência de corte inferior (Hz) - se None, calcula a partir de bandwidth
+        high_cutoff: Frequência de corte superior (Hz) - se None, calcula a partir de bandwidth
+        filter_shape: Forma do filtro ('gaussian' ou 'sinc')
+    
+    Returns:
+        Array com os valores do filtro no domínio da frequência (n_samples // 2 + 1 bins)
+    """
+    # Calcula as frequências correspondentes a cada bin da FFT real
+    # O filtro é construído em float32 (precisão simples basta para áudio)
+    freqs = _frequency_grid(n_samples, sample_rate)
+    
+    # Calcula as frequências de corte
+    low_freq, high_freq, effective_bandwidth = _resolve_band_edges(
+        sample_rate, center_freq, bandwidth, low_cutoff, high_cutoff)
+    
+    if filter_shape == 'sinc':
+        # Filtro passa-faixa usando resposta ao impulso com sinc
+        h = create_bandpass_kernel(n_samples, sample_rate, low_freq, high_freq, effective_bandwidth)
         
         # Converte para o domínio da frequência usando FFT
         # Preenche com zeros até n_samples para ter o mesmo tamanho do sinal
-        h_padded = np.zeros(n_samples, dtype=np.float64)
+        h_padded = np.zeros(n_samples, dtype=np.float32)
         M = len(h) // 2
         # Coloca o filtro centralizado (h[0] no índice 0, h[-M:] no final para circularidade)
         h_padded[:M+1] = h[M:]
         if M > 0:
             h_padded[-M:] = h[:M]
         
-        # Calcula a FFT do filtro
-        filter_response = fft(h_padded)
-        # Usa apenas a magnitude (filtro passa-faixa ideal tem fase zero)
-        filter_response = np.abs(filter_response)
-        
-        return filter_response
+        # Calcula a FFT do filtro. O kernel é real e simétrico em torno do índice 0,
+        # então o espectro é real (fase zero): usa a parte real diretamente, sem o
+        # módulo, o que também preserva o sinal das ondulações da banda de rejeição
+        # (a mesma resposta que a convolução com h no overlap-save aplica)
+        return np.ascontiguousarray(rfft(h_padded).real)
     
     elif filter_shape == 'gaussian':
         # Filtro gaussiano (transições suaves)
         # Para filtros com frequências de corte específicas, ajusta o sigma para que
         # o filtro tenha transição suave entre low_freq e high_freq
         # Usa desvio padrão baseado na largura de banda efetiva
-        sigma = effective_bandwidth / (2 * np.sqrt(2 * np.log(2)))  # FWHM = 2.355 * sigma
-        filter_response = np.exp(-0.5 * ((freqs - center_freq) / sigma) ** 2)
+        sigma = float(effective_bandwidth / (2 * np.sqrt(2 * np.log(2))))  # FWHM = 2.355 * sigma
+        filter_response = gaussian_response(freqs, center_freq, sigma)
         
         # Aplica uma janela para garantir que o filtro seja zero fora do intervalo [low_freq, high_freq]
         # Isso garante que as frequências de corte sejam respeitadas
-        window = np.ones_like(freqs)
-        window[freqs < low_freq] = 0.0
-        window[freqs > high_freq] = 0.0
-        # Transição suave nas bordas (opcional, pode ser removido para transição mais abrupta)
-        transition_width = effective_bandwidth * 0.1  # 10% da largura de banda para transição
-        if transition_width > 0:
-            # Transição suave na borda inferior
-            transition_low = (freqs >= low_freq) & (freqs < low_freq + transition_width)
-            window[transition_low] = (freqs[transition_low] - low_freq) / transition_width
-            # Transição suave na borda superior
-            transition_high = (freqs > high_freq - transition_width) & (freqs <= high_freq)
-            window[transition_high] = (high_freq - freqs[transition_high]) / transition_width
-        
-        filter_response *= window
+        filter_response *= _band_edge_window(freqs, low_freq, high_freq, effective_bandwidth)
         return filter_response
     else:
         raise ValueError(f"filter_shape deve ser 'sinc' ou 'gaussian', recebido: {filter_shape}")
 
 
+def _band_edge_window(freqs, low_freq, high_freq, effective_bandwidth):
+    """
+    Janela que zera o filtro fora de [low_freq, high_freq], com transições lineares nas bordas.
+    
+    Args:
+        freqs: Array com as frequências (Hz)
+        low_freq: Frequência de corte inferior (Hz)
+        high_freq: Frequência de corte superior (Hz)
+        effective_bandwidth: Largura de banda efetiva (Hz)
+    
+    Returns:
+        Array com a janela (mesmo formato de freqs)
+    """
+    # Transição suave nas bordas (opcional, pode ser removido para transição mais abrupta)
+    transition_width = effective_bandwidth * 0.1  # 10% da largura de banda para transição
+    if transition_width <= 0:
+        return ((freqs >= low_freq) & (freqs <= high_freq)).astype(freqs.dtype)
+    
+    # Rampas lineares limitadas a [0, 1]: a inferior sobe de 0 (em low_freq) até 1
+    # (em low_freq + transition_width) e a superior desce de 1 até 0 (em high_freq).
+    # O produto vale 0 fora do intervalo e 1 no meio, sem máscaras booleanas
+    window = np.subtract(freqs, low_freq)
+    window *= 1.0 / transition_width
+    np.clip(window, 0.0, 1.0, out=window)
+    ramp_high = np.subtract(high_freq, freqs)
+    ramp_high *= 1.0 / transition_width
+    np.clip(ramp_high, 0.0, 1.0, out=ramp_high)
+    window *= ramp_high
+    return window
+
+
+def create_filter_bank(n_samples, sample_rate, center_frequencies, cutoff_frequencies,
+                       filter_shape='gaussian'):
+    """
+    Cria os filtros de várias bandas de uma vez, empilhados em um único array.
+    
+    Equivale a chamar create_frequency_filter para cada banda com as frequências de
+    corte fornecidas. No formato gaussiano, as curvas de todas as bandas são
+    calculadas em uma única passada vetorizada (broadcasting frequências x bandas).
+    
+    Args:
+        n_samples: Número de amostras do sinal
+        sample_rate: Taxa de amostragem (Hz)
+        center_frequencies: Lista com as frequências centrais das bandas (Hz)
+        cutoff_frequencies: Pares (low_cutoff, high_cutoff) de cada banda (Hz), como os
+                            devolvidos por calculate_cutoff_frequencies
+        filter_shape: Forma do filtro ('gaussian' ou 'sinc')
+    
+    Returns:
+        Array (n_bandas, n_samples // 2 + 1) com os filtros no domínio da frequência
+    """
+    if filter_shape != 'gaussian':
+        return np.stack([
+            create_frequency_filter(n_samples, sample_rate, center_freq,
+                                    bandwidth=high_cutoff - low_cutoff,
+                                    low_cutoff=low_cutoff, high_cutoff=high_cutoff,
+                                    filter_shape=filter_shape)
+            for center_freq, (low_cutoff, high_cutoff) in zip(center_frequencies, cutoff_frequencies)
+        ])
+    
+    freqs = _frequency_grid(n_samples, sample_rate)
+    band_edges = [_resolve_band_edges(sample_rate, center_freq, high_cutoff - low_cutoff,
+                                      low_cutoff, high_cutoff)
+                  for center_freq, (low_cutoff, high_cutoff) in zip(center_frequencies, cutoff_frequencies)]
+    
+    # Uma linha por banda: centros e sigmas com formato (n_bandas, 1) para o broadcasting
+    centers = np.asarray(center_frequencies, dtype=np.float32)[:, np.newaxis]
+    bandwidths = np.array([edges[2] for edges in band_edges], dtype=np.float32)[:, np.newaxis]
+    sigmas = bandwidths / np.float32(2 * np.sqrt(2 * np.log(2)))  # FWHM = 2.355 * sigma
+    filter_bank = gaussian_response(freqs, centers, sigmas)
+    
+    for band, (low_freq, high_freq, effective_bandwidth) in enumerate(band_edges):
+        filter_bank[band] *= _band_edge_window(freqs, low_freq, high_freq, effective_bandwidth)
+    
+    return filter_bank
+
+
 def apply_bandpass_filter(audio, sample_rate, center_freq, bandwidth=50, 
                           low_cutoff=None, high_cutoff=None, filter_shape='sinc'):
     """
     Aplica um filtro passa-banda centrado em uma frequência específica.
     
     Args:
-        audio: Array numpy com o sinal de áudio
+        audio: Array numpy com o sinal de áudio (1D ou (canais, amostras))
         sample_rate: Taxa de amostragem do áudio
         center_freq: Frequência central do filtro (Hz)
         bandwidth: Largura de banda do filtro (Hz) - usado apenas se low_cutoff/high_cutoff não fornecidos
@@ -211,90 +487,288 @@ def apply_bandpass_filter(audio, sample_rate, center_freq, bandwidth=50,
     Returns:
         Áudio filtrado
     """
-    n_samples = len(audio)
+    blocks = list(iter_bandpass_filter(audio, sample_rate, center_freq, bandwidth,
+                                       low_cutoff, high_cutoff, filter_shape))
+    if len(blocks) == 1:
+        return blocks[0]
+    return np.concatenate(blocks, axis=-1)
+
+
+def iter_bandpass_filter(audio, sample_rate, center_freq, bandwidth=50,
+                         low_cutoff=None, high_cutoff=None, filter_shape='sinc'):
+    """
+    Aplica o filtro passa-banda, produzindo o áudio filtrado em blocos consecutivos.
     
-    # Converte para o domínio da frequência
-    audio_fft = fft(audio)
+    Para o filtro sinc em sinais bem maiores que o kernel, usa overlap-save e cada
+    bloco pode ser consumido (ex: gravado em disco) sem montar a saída inteira.
+    Nos demais casos a filtragem é feita com uma única FFT e produz um só bloco.
+    Os argumentos são os mesmos de apply_bandpass_filter.
+    
+    Yields:
+        Blocos do áudio filtrado (último eixo = amostras)
+    """
+    n_samples = audio.shape[-1]
+    
+    if filter_shape == 'sinc':
+        # Para sinais bem maiores que o kernel, filtra em blocos (overlap-save)
+        low_freq, high_freq, effective_bandwidth = _resolve_band_edges(
+            sample_rate, center_freq, bandwidth, low_cutoff, high_cutoff)
+        h = create_bandpass_kernel(n_samples, sample_rate, low_freq, high_freq, effective_bandwidth)
+        if n_samples > 4 * len(h):
+            yield from overlap_save_blocks(audio, h)
+            return
+    
+    # Preenche com zeros até um tamanho que a FFT processa diretamente
+    n_fft = next_fast_len(n_samples)
+    
+    # Converte para o domínio da frequência (apenas frequências não negativas)
+    audio_fft = rfft(audio, n=n_fft)
     
     # Cria o filtro no domínio da frequência
-    filter_response = create_frequency_filter(n_samples, sample_rate, center_freq, bandwidth, 
+    filter_response = create_frequency_filter(n_fft, sample_rate, center_freq, bandwidth, 
                                              low_cutoff=low_cutoff, high_cutoff=high_cutoff, 
                                              filter_shape=filter_shape)
     
-    # Aplica o filtro multiplicando no domínio da frequência
-    filtered_fft = audio_fft * filter_response
+    # Aplica o filtro multiplicando no domínio da frequência (no próprio espectro)
+    audio_fft *= filter_response
     
-    # Converte de volta para o domínio do tempo
-    filtered_audio = np.real(ifft(filtered_fft))
+    # Converte de volta para o domínio do tempo e remove o preenchimento
+    yield irfft(audio_fft, n=n_fft)[..., :n_samples]
+
+
+def peaking_sos(sample_rate, center_freq, gain_db, q):
+    """
+    Projeta filtros peaking (biquad) conforme o RBJ Audio EQ Cookbook.
+    
+    Aceita escalares ou arrays (uma seção por elemento, com broadcasting).
+    Com gain_db = 0 a seção se reduz a b = a (resposta unitária).
     
-    return filtered_audio
+    Args:
+        sample_rate: Taxa de amostragem (Hz)
+        center_freq: Frequência central de cada seção (Hz)
+        gain_db: Ganho de cada seção na frequência central (dB)
+        q: Fator Q de cada seção (f0 / largura de banda)
+    
+    Returns:
+        Array (n_seções, 6) no formato SOS do scipy.signal
+    """
+    f0, gain_db, q = np.broadcast_arrays(np.atleast_1d(np.asarray(center_freq, dtype=np.float64)),
+                                         np.asarray(gain_db, dtype=np.float64),
+                                         np.asarray(q, dtype=np.float64))
+    
+    # A = 10^(AdB/40): metade do ganho no numerador e metade no denominador
+    a_gain = 10.0 ** (gain_db / 40.0)
+    w0 = 2.0 * np.pi * f0 / sample_rate
+    alpha = np.sin(w0) / (2.0 * q)
+    cos_w0 = np.cos(w0)
+    
+    a0 = 1.0 + alpha / a_gain
+    sos = np.empty((len(f0), 6))
+    sos[:, 0] = (1.0 + alpha * a_gain) / a0
+    sos[:, 1] = -2.0 * cos_w0 / a0
+    sos[:, 2] = (1.0 - alpha * a_gain) / a0
+    sos[:, 3] = 1.0
+    sos[:, 4] = sos[:, 1]
+    sos[:, 5] = (1.0 - alpha / a_gain) / a0
+    return sos
 
 
 def apply_parametric_eq(audio, sample_rate, center_freq, gain_db=0, q=1.0):
     """
-    Aplica um equalizador paramétrico (boost/cut) em uma frequência específica usando FFT.
+    Aplica um equalizador paramétrico (boost/cut) em uma frequência específica.
+    
+    Usa um filtro peaking de segunda ordem (biquad) aplicado para frente e para
+    trás (scipy.signal.sosfiltfilt): O(N) por amostra, sem FFT do sinal inteiro, e
+    com fase zero. Como a resposta é aplicada duas vezes, cada passada usa metade
+    do ganho em dB, para que o ganho na frequência central seja gain_db.
+    
+    A forma da banda não é a do antigo filtro gaussiano: para o mesmo Q, a faixa
+    com metade do ganho é simétrica em escala logarítmica e tem outra largura
+    (ex.: 1 kHz, +6 dB, Q=1: ~619-1612 Hz, contra ~439-1561 Hz do gaussiano).
     
     Args:
-        audio: Array numpy com o sinal de áudio
+        audio: Array numpy com o sinal de áudio (1D ou (canais, amostras))
         sample_rate: Taxa de amostragem do áudio
-        center_freq: Frequência central (Hz)
+        center_freq: Frequência central (Hz), entre 0 e a frequência de Nyquist
+                     (fora dessa faixa levanta ValueError)
         gain_db: Ganho em dB (positivo = boost, negativo = cut)
         q: Fator Q (largura do filtro, maior = mais estreito)
     
     Returns:
         Áudio filtrado
     """
-    if gain_db == 0:
-        return audio
+    # O biquad só é estável com a frequência central entre 0 e Nyquist
+    if not 0 < center_freq < sample_rate / 2.0:
+        raise ValueError(f"Frequência central deve estar entre 0 e {sample_rate / 2.0:g} Hz "
+                         f"(Nyquist), recebido {center_freq:g} Hz")
     
-    n_samples = len(audio)
+    if gain_db == 0 or audio.shape[-1] == 0:
+        return audio
     
-    # Converte ganho de dB para linear
-    gain_linear = 10 ** (gain_db / 20.0)
+    # Metade do ganho por passada (ida e volta)
+    sos = peaking_sos(sample_rate, center_freq, gain_db / 2.0, q)
     
-    # Calcula largura de banda a partir do Q
-    bandwidth = center_freq / q
+    # Filtra todos os canais ao longo do último eixo, mantendo o tipo de entrada.
+    # O preenchimento das bordas é limitado ao tamanho do sinal, para que sinais
+    # curtos também possam ser filtrados
+    padlen = min(3 * (2 * len(sos) + 1), audio.shape[-1] - 1)
+    output = signal.sosfiltfilt(sos, audio, axis=-1, padlen=padlen).astype(audio.dtype, copy=False)
     
-    # Converte para o domínio da frequência
-    audio_fft = fft(audio)
+    # Normaliza para evitar clipping
+    normalize_peak(output)
     
-    # Cria o filtro paramétrico no domínio da frequência
-    freqs = fftfreq(n_samples, 1.0 / sample_rate)
-    freqs = np.abs(freqs)
+    return output
+
+
+def apply_multiband_eq(audio, sample_rate, center_frequencies, gains_db, filter_shape='sinc'):
+    """
+    Aplica um equalizador de várias bandas com uma única FFT direta e uma inversa.
     
-    # Filtro gaussiano para o equalizador paramétrico
-    sigma = bandwidth / (2 * np.sqrt(2 * np.log(2)))
-    filter_response = np.exp(-0.5 * ((freqs - center_freq) / sigma) ** 2)
+    As frequências de corte ficam no meio entre as frequências centrais
+    (calculate_cutoff_frequencies), como no equalizador em tempo real. Os filtros
+    das bandas são combinados em uma única resposta 1 + Σ (A_i - 1) * H_i, com
+    A_i = 10^(AdB_i/20), aplicada ao espectro do sinal inteiro.
     
-    # Aplica o ganho apenas na faixa de frequências do filtro
-    # Para boost: multiplica a resposta do filtro pelo ganho e adiciona ao sinal original
-    # Para cut: reduz a resposta do filtro do sinal original
-    if gain_db > 0:
-        # Boost: adiciona o sinal filtrado amplificado
-        eq_response = 1.0 + filter_response * (gain_linear - 1.0)
-    else:
-        # Cut: reduz o sinal filtrado
-        eq_response = 1.0 - filter_response * (1.0 - gain_linear)
+    Args:
+        audio: Array numpy com o sinal de áudio (1D ou (canais, amostras))
+        sample_rate: Taxa de amostragem do áudio
+        center_frequencies: Lista com as frequências centrais das bandas (Hz)
+        gains_db: Ganho em dB de cada banda (positivo = boost, negativo = cut)
+        filter_shape: Forma dos filtros das bandas ('sinc' ou 'gaussian')
     
-    # Aplica o equalizador
-    filtered_fft = audio_fft * eq_response
+    Returns:
+        Áudio equalizado
+    """
+    weights = 10.0 ** (np.asarray(gains_db, dtype=np.float64) / 20.0) - 1.0
+    if not weights.any():
+        return audio
     
-    # Converte de volta para o domínio do tempo
-    output = np.real(ifft(filtered_fft))
+    n_samples = audio.shape[-1]
+    n_fft = next_fast_len(n_samples)
+    cutoff_frequencies = calculate_cutoff_frequencies(center_frequencies, sample_rate)
+    
+    # Resposta combinada, acumulada banda a banda no mesmo buffer (sem empilhar os
+    # filtros de todas as bandas, que teriam o tamanho do sinal cada um)
+    eq_response = np.ones(n_fft // 2 + 1, dtype=np.float32)
+    for center_freq, (low_cutoff, high_cutoff), weight in zip(center_frequencies, cutoff_frequencies, weights):
+        if weight == 0.0:
+            continue
+        band_filter = create_frequency_filter(n_fft, sample_rate, center_freq,
+                                              bandwidth=high_cutoff - low_cutoff,
+                                              low_cutoff=low_cutoff, high_cutoff=high_cutoff,
+                                              filter_shape=filter_shape)
+        band_filter *= weight
+        eq_response += band_filter
+    
+    # Uma única FFT direta e uma inversa para todas as bandas e canais
+    audio_fft = rfft(audio, n=n_fft)
+    audio_fft *= eq_response
+    output = irfft(audio_fft, n=n_fft)[..., :n_samples]
     
     # Normaliza para evitar clipping
-    max_val = np.max(np.abs(output))
-    if max_val > 1.0:
-        output = output / max_val
+    normalize_peak(output)
     
     return output
 
 
+def normalize_peak(audio):
+    """
+    Normaliza o sinal (no próprio array) para que o pico absoluto não passe de 1.0.
+    
+    O pico é obtido de max() e min(), sem alocar o array temporário de np.abs,
+    e a escala é aplicada no próprio buffer.
+    
+    Args:
+        audio: Array numpy com o sinal de áudio (modificado no lugar)
+    
+    Returns:
+        O mesmo array, normalizado se necessário
+    """
+    peak = max(float(audio.max()), -float(audio.min()))
+    if peak > 1.0:
+        audio *= 1.0 / peak
+    return audio
+
+
+def load_audio(input_file):
+    """
+    Carrega um arquivo de áudio na taxa de amostragem original.
+    
+    Usa soundfile diretamente (libsndfile lê WAV, FLAC, OGG e MP3), o que evita a
+    importação do librosa e as conversões extras de librosa.load. O librosa só é
+    usado para formatos que o soundfile não consegue decodificar.
+    
+    Args:
+        input_file: Caminho do arquivo de áudio
+    
+    Returns:
+        Tupla (audio, sample_rate), com audio no formato (canais, amostras)
+    """
+    try:
+        audio, sample_rate = sf.read(input_file, dtype='float32', always_2d=True)
+        return audio.T, sample_rate
+    except RuntimeError:
+        # Formato não suportado pelo libsndfile: recorre ao librosa
+        import librosa
+        audio, sample_rate = librosa.load(input_file, sr=None, mono=False)
+        if audio.ndim == 1:
+            audio = audio.reshape(1, -1)
+        return audio, sample_rate
+
+
+def _open_bandpass_stream(input_file, center_freq, bandwidth):
+    """
+    Abre o arquivo para aplicar o filtro passa-banda sinc lendo-o em blocos.
+    
+    Só é possível quando o soundfile consegue ler o arquivo e o sinal é bem maior
+    que o kernel (mesmo critério de iter_bandpass_filter para usar overlap-save).
+    
+    Args:
+        input_file: Caminho do arquivo de entrada
+        center_freq: Frequência central do filtro (Hz)
+        bandwidth: Largura de banda (Hz)
+    
+    Returns:
+        Tupla (source, blocks): o arquivo aberto e o gerador de blocos filtrados,
+        ou (None, None) se o arquivo deve ser carregado inteiro
+    """
+    try:
+        source = sf.SoundFile(input_file)
+    except RuntimeError:
+        return None, None
+    
+    sample_rate = source.samplerate
+    n_samples = source.frames
+    low_freq, high_freq, effective_bandwidth = _resolve_band_edges(
+        sample_rate, center_freq, bandwidth, None, None)
+    h = create_bandpass_kernel(n_samples, sample_rate, low_freq, high_freq, effective_bandwidth)
+    if n_samples <= 4 * len(h):
+        source.close()
+        return None, None
+    
+    read_buffer = None
+    
+    def read_into(buffer):
+        # O soundfile lê no formato (amostras, canais); converte para (canais, amostras)
+        nonlocal read_buffer
+        if read_buffer is None or len(read_buffer) != buffer.shape[-1]:
+            read_buffer = np.empty((buffer.shape[-1], source.channels), dtype=np.float32)
+        frames = source.read(dtype='float32', always_2d=True, out=read_buffer)
+        buffer[..., :len(frames)] = frames.T
+        return len(frames)
+    
+    blocks = overlap_save_stream(read_into, (source.channels, n_samples), h)
+    return source, blocks
+
+
 def process_audio(input_file, output_file=None, center_freq=100, bandwidth=50, 
                   filter_type='bandpass', gain_db=0, q=1.0, filter_shape='sinc'):
     """
     Processa um arquivo de áudio aplicando um filtro de frequência.
     
+    O áudio filtrado é mantido inteiro em memória e devolvido; para arquivos
+    longos, process_audio_to_file grava a saída em blocos sem mantê-la em memória.
+    
     Args:
         input_file: Caminho do arquivo de entrada
         output_file: Caminho do arquivo de saída (opcional)
@@ -305,41 +779,33 @@ def process_audio(input_file, output_file=None, center_freq=100, bandwidth=50,
         q: Fator Q (apenas para equalizador paramétrico)
         filter_shape: Forma do filtro ('sinc' ou 'gaussian')
                      'sinc' usa a resposta ao impulso matemática com numpy.sinc (padrão)
+    
+    Returns:
+        Tupla (filtered_audio, sample_rate), com filtered_audio 1D para áudio mono
+        ou no formato (amostras, canais)
     """
     print(f"Carregando arquivo: {input_file}")
     
-    # Carrega o áudio
-    audio, sample_rate = librosa.load(input_file, sr=None, mono=False)
-    
-    # Se o áudio for mono, converte para formato 2D
-    if audio.ndim == 1:
-        audio = audio.reshape(1, -1)
+    # Carrega o áudio no formato (canais, amostras), mesmo se for mono
+    audio, sample_rate = load_audio(input_file)
+    audio = np.ascontiguousarray(audio, dtype=np.float32)
     
     print(f"Taxa de amostragem: {sample_rate} Hz")
-    print(f"Duração: {len(audio[0]) / sample_rate:.2f} segundos")
+    print(f"Duração: {audio.shape[-1] / sample_rate:.2f} segundos")
     print(f"Canais: {audio.shape[0]}")
     print(f"Aplicando filtro centrado em {center_freq} Hz...")
     
-    # Processa cada canal
-    filtered_channels = []
-    for channel in audio:
-        if filter_type == 'bandpass':
-            filtered = apply_bandpass_filter(channel, sample_rate, center_freq, bandwidth, filter_shape)
-        elif filter_type == 'parametric':
-            filtered = apply_parametric_eq(channel, sample_rate, center_freq, gain_db, q)
-        else:
-            filtered = apply_bandpass_filter(channel, sample_rate, center_freq, bandwidth, filter_shape)
-        
-        filtered_channels.append(filtered)
-    
-    # Combina os canais
-    filtered_audio = np.array(filtered_channels)
+    # Processa todos os canais de uma vez (FFT ao longo do último eixo)
+    if filter_type == 'parametric':
+        filtered_audio = apply_parametric_eq(audio, sample_rate, center_freq, gain_db, q)
+    else:
+        filtered_audio = apply_bandpass_filter(audio, sample_rate, center_freq, bandwidth,
+                                               filter_shape=filter_shape)
     
-    # Se for mono, converte de volta para 1D
+    # Se for mono, converte de volta para 1D; senão, transpõe para (samples, channels)
     if filtered_audio.shape[0] == 1:
         filtered_audio = filtered_audio[0]
     else:
-        # Transpõe para formato (samples, channels)
         filtered_audio = filtered_audio.T
     
     # Salva o arquivo de saída
@@ -354,6 +820,85 @@ def process_audio(input_file, output_file=None, center_freq=100, bandwidth=50,
     return filtered_audio, sample_rate
 
 
+def process_audio_to_file(input_file, output_file=None, center_freq=100, bandwidth=50,
+                          filter_type='bandpass', gain_db=0, q=1.0, filter_shape='sinc'):
+    """
+    Processa um arquivo de áudio aplicando um filtro de frequência, gravando a
+    saída em blocos.
+    
+    Ao contrário de process_audio, o áudio filtrado não é mantido inteiro em
+    memória (o filtro sinc em arquivos longos também lê a entrada em blocos).
+    
+    Args:
+        input_file: Caminho do arquivo de entrada
+        output_file: Caminho do arquivo de saída (opcional)
+        center_freq: Frequência central do filtro (Hz)
+        bandwidth: Largura de banda (apenas para filtro passa-banda)
+        filter_type: Tipo de filtro ('bandpass' ou 'parametric')
+        gain_db: Ganho em dB (apenas para equalizador paramétrico)
+        q: Fator Q (apenas para equalizador paramétrico)
+        filter_shape: Forma do filtro ('sinc' ou 'gaussian')
+                     'sinc' usa a resposta ao impulso matemática com numpy.sinc (padrão)
+    
+    Returns:
+        Tupla (output_file, sample_rate). O áudio filtrado é gravado em blocos
+        diretamente no arquivo de saída, sem ser mantido inteiro em memória.
+    """
+    print(f"Carregando arquivo: {input_file}")
+    
+    # O filtro sinc em arquivos longos é aplicado lendo o arquivo em blocos
+    # (overlap-save), sem carregá-lo inteiro; os demais casos usam o sinal completo
+    source = None
+    if filter_type != 'parametric' and filter_shape == 'sinc':
+        source, blocks = _open_bandpass_stream(input_file, center_freq, bandwidth)
+    
+    if source is not None:
+        sample_rate = source.samplerate
+        n_samples = source.frames
+        n_channels = source.channels
+    else:
+        # Carrega o áudio no formato (canais, amostras), mesmo se for mono
+        # (em float32 contíguo, mantido em precisão simples até a saída)
+        audio, sample_rate = load_audio(input_file)
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        n_channels, n_samples = audio.shape
+    
+    print(f"Taxa de amostragem: {sample_rate} Hz")
+    print(f"Duração: {n_samples / sample_rate:.2f} segundos")
+    print(f"Canais: {n_channels}")
+    print(f"Aplicando filtro centrado em {center_freq} Hz...")
+    
+    # Processa todos os canais de uma vez (FFT ao longo do último eixo); na leitura
+    # em blocos, o gerador já foi criado ao abrir o arquivo
+    if source is None:
+        if filter_type == 'parametric':
+            blocks = [apply_parametric_eq(audio, sample_rate, center_freq, gain_db, q)]
+        else:
+            blocks = iter_bandpass_filter(audio, sample_rate, center_freq, bandwidth,
+                                          filter_shape=filter_shape)
+    
+    # Salva o arquivo de saída
+    if output_file is None:
+        base_name = os.path.splitext(input_file)[0]
+        output_file = f"{base_name}_filtered_{center_freq}Hz.wav"
+    
+    print(f"Salvando arquivo filtrado: {output_file}")
+    write_size = 65536  # Amostras por escrita
+    try:
+        with sf.SoundFile(output_file, 'w', samplerate=sample_rate, channels=n_channels) as out:
+            for block in blocks:
+                # soundfile espera o formato (samples, channels) contíguo; grava em fatias
+                # para que a cópia transposta nunca tenha o tamanho do arquivo inteiro
+                for start in range(0, block.shape[-1], write_size):
+                    out.write(block[..., start:start + write_size].T)
+    finally:
+        if source is not None:
+            source.close()
+    
+    print("Processamento concluído!")
+    return output_file, sample_rate
+
+
 def main():
     parser = argparse.ArgumentParser(description='Filtro de frequência para áudio')
     parser.add_argument('input_file', help='Arquivo de áudio de entrada')
@@ -363,11 +908,13 @@ def main():
     parser.add_argument('-b', '--bandwidth', type=float, default=50,
                        help='Largura de banda (Hz) - padrão: 50')
     parser.add_argument('-t', '--type', choices=['bandpass', 'parametric'], 
-                       default='bandpass', help='Tipo de filtro')
+                       default='bandpass',
+                       help="Tipo de filtro ('parametric' usa um peaking biquad; a forma "
+                            "da banda difere do antigo filtro gaussiano)")
     parser.add_argument('-g', '--gain', type=float, default=0,
                        help='Ganho em dB (apenas para filtro paramétrico)')
     parser.add_argument('-q', '--q', type=float, default=1.0,
-                       help='Fator Q (apenas para filtro paramétrico)')
+                       help='Fator Q do peaking biquad (apenas para filtro paramétrico)')
     
     args = parser.parse_args()
     
@@ -375,15 +922,18 @@ def main():
         print(f"Erro: Arquivo '{args.input_file}' não encontrado!")
         return
     
-    process_audio(
-        args.input_file,
-        args.output,
-        center_freq=args.freq,
-        bandwidth=args.bandwidth,
-        filter_type=args.type,
-        gain_db=args.gain,
-        q=args.q
-    )
+    try:
+        process_audio_to_file(
+            args.input_file,
+            args.output,
+            center_freq=args.freq,
+            bandwidth=args.bandwidth,
+            filter_type=args.type,
+            gain_db=args.gain,
+            q=args.q
+        )
+    except ValueError as e:
+        print(f"Erro: {e}")
 
 
 if __name__ == '__main__':
@@ -393,7 +943,7 @@ if __name__ == '__main__':
         default_file = "tracks/The Cure - In Between Days.mp3"
         if os.path.exists(default_file):
             print("Executando com arquivo padrão...")
-            process_audio(default_file, center_freq=100, bandwidth=50)
+            process_audio_to_file(default_file, center_freq=100, bandwidth=50)
         else:
             print("Uso: python equalizer.py <arquivo_audio> [opções]")
             print("\nExemplo:")
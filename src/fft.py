@@ -3,6 +3,7 @@ Implementação da FFT (Fast Fourier Transform) compatível com numpy.fft.fft
 Usa o algoritmo Cooley-Tukey para calcular a Transformada de Fourier Discreta (DFT)
 """
 
+import functools
 import numpy as np
 from typing import Union, Optional
 
@@ -31,53 +32,17 @@ def fft(x: np.ndarray, n: Optional[int] = None, axis: int = -1, norm: Optional[s
     out : ndarray
         Array complexo com a FFT do sinal de entrada
     """
-    x = np.asarray(x)
+    x = _prepare(x, n, axis)
+    n = x.shape[-1]
     
-    # Se n não foi especificado, usa o tamanho do array ao longo do axis
-    if n is None:
-        n = x.shape[axis] if axis >= 0 else x.shape[x.ndim + axis]
-    
-    # Prepara o array: truncar ou preencher com zeros se necessário
-    if axis == -1 or axis == x.ndim - 1:
-        # Caso mais comum: último eixo
-        if x.shape[-1] < n:
-            # Preenche com zeros
-            pad_shape = list(x.shape)
-            pad_shape[-1] = n - x.shape[-1]
-            x = np.concatenate([x, np.zeros(pad_shape, dtype=x.dtype)], axis=-1)
-        elif x.shape[-1] > n:
-            # Trunca
-            x = x[..., :n]
-    else:
-        # Para outros eixos, precisa de manipulação mais complexa
-        # Por simplicidade, vamos mover o eixo para o final, processar e mover de volta
-        x = np.moveaxis(x, axis, -1)
-        if x.shape[-1] < n:
-            pad_shape = list(x.shape)
-            pad_shape[-1] = n - x.shape[-1]
-            x = np.concatenate([x, np.zeros(pad_shape, dtype=x.dtype)], axis=-1)
-        elif x.shape[-1] > n:
-            x = x[..., :n]
-        x = np.moveaxis(x, -1, axis)
-    
-    # Converte para complexo se necessário
-    if not np.iscomplexobj(x):
-        x = x.astype(np.complex128)
-    
-    # Aplica a FFT ao longo do eixo especificado
-    if axis == -1 or axis == x.ndim - 1:
-        result = _fft_1d(x)
-    else:
-        # Para outros eixos, move para o final, processa e move de volta
-        x_moved = np.moveaxis(x, axis, -1)
-        result_moved = _fft_1d(x_moved)
-        result = np.moveaxis(result_moved, -1, axis)
+    # Aplica a FFT ao longo do último eixo (o eixo pedido já foi movido para o final)
+    result = _fft_1d(x)
     
     # Aplica normalização se especificada
     if norm == 'ortho':
-        result = result / np.sqrt(n)
+        result *= 1.0 / np.sqrt(n)
     
-    return result
+    return np.moveaxis(result, -1, axis)
 
 
 def ifft(x: np.ndarray, n: Optional[int] = None, axis: int = -1, norm: Optional[str] = None) -> np.ndarray:
@@ -102,185 +67,286 @@ def ifft(x: np.ndarray, n: Optional[int] = None, axis: int = -1, norm: Optional[
     out : ndarray
         Array complexo com a IFFT do sinal de entrada
     """
-    x = np.asarray(x)
-    
-    if n is None:
-        n = x.shape[axis] if axis >= 0 else x.shape[x.ndim + axis]
+    x = _prepare(x, n, axis)
+    n = x.shape[-1]
     
     # IFFT é calculada como: IFFT(x) = conj(FFT(conj(x))) / n
-    # Ou: IFFT(x) = FFT(conj(x)) / n (e depois tomar o conjugado)
-    x_conj = np.conj(x)
-    
-    # Prepara o array similar à FFT
-    if axis == -1 or axis == x.ndim - 1:
-        if x_conj.shape[-1] < n:
-            pad_shape = list(x_conj.shape)
-            pad_shape[-1] = n - x_conj.shape[-1]
-            x_conj = np.concatenate([x_conj, np.zeros(pad_shape, dtype=x_conj.dtype)], axis=-1)
-        elif x_conj.shape[-1] > n:
-            x_conj = x_conj[..., :n]
-    else:
-        x_conj = np.moveaxis(x_conj, axis, -1)
-        if x_conj.shape[-1] < n:
-            pad_shape = list(x_conj.shape)
-            pad_shape[-1] = n - x_conj.shape[-1]
-            x_conj = np.concatenate([x_conj, np.zeros(pad_shape, dtype=x_conj.dtype)], axis=-1)
-        elif x_conj.shape[-1] > n:
-            x_conj = x_conj[..., :n]
-        x_conj = np.moveaxis(x_conj, -1, axis)
-    
-    if not np.iscomplexobj(x_conj):
-        x_conj = x_conj.astype(np.complex128)
-    
-    # Calcula FFT do conjugado
-    if axis == -1 or axis == x_conj.ndim - 1:
-        result = _fft_1d(x_conj)
-    else:
-        x_moved = np.moveaxis(x_conj, axis, -1)
-        result_moved = _fft_1d(x_moved)
-        result = np.moveaxis(result_moved, -1, axis)
+    result = _fft_1d(np.conjugate(x))
+    np.conjugate(result, out=result)
     
     # Aplica normalização
     if norm == 'ortho':
-        result = np.conj(result) / np.sqrt(n)
+        result *= 1.0 / np.sqrt(n)
     else:
-        result = np.conj(result) / n
+        result *= 1.0 / n
     
-    return result
+    return np.moveaxis(result, -1, axis)
 
 
-def _fft_1d(x: np.ndarray) -> np.ndarray:
+def _prepare(x: np.ndarray, n: Optional[int], axis: int) -> np.ndarray:
     """
-    Calcula a FFT 1D usando o algoritmo Cooley-Tukey (recursivo).
+    Prepara a entrada de fft()/ifft(): move o eixo da transformada para o final,
+    trunca ou preenche com zeros até n amostras e converte para o tipo complexo.
     
-    Esta função processa arrays multi-dimensionais aplicando FFT
-    ao longo da última dimensão.
+    A cópia (quando necessária) é feita uma única vez: o preenchimento escreve o
+    sinal, já convertido, em um array de zeros do tamanho final.
     
     Parâmetros:
     -----------
-    x : ndarray
-        Array complexo (pode ser multi-dimensional)
+    x : array_like
+        Array de entrada
+    n : int ou None
+        Tamanho da transformada (None = tamanho atual do eixo)
+    axis : int
+        Eixo da transformada
         
     Retorna:
     --------
     out : ndarray
-        Array complexo com a FFT aplicada ao longo da última dimensão
+        Array complexo com a transformada ao longo do último eixo e n amostras
     """
-    # Se o array é multi-dimensional, aplica recursivamente
-    if x.ndim > 1:
-        # Aplica FFT a cada "fatia" ao longo da última dimensão
-        result = np.zeros_like(x, dtype=np.complex128)
-        for idx in np.ndindex(x.shape[:-1]):
-            result[idx] = _fft_1d_recursive(x[idx])
-        return result
-    else:
-        return _fft_1d_recursive(x)
+    x = np.moveaxis(np.asarray(x), axis, -1)
+    dtype = _complex_dtype(x.dtype)
+    
+    if n is None or n == x.shape[-1]:
+        return x.astype(dtype, copy=False)
+    
+    sized = np.zeros(x.shape[:-1] + (n,), dtype=dtype)
+    m = min(n, x.shape[-1])
+    sized[..., :m] = x[..., :m]
+    return sized
 
 
-def _fft_1d_recursive(x: np.ndarray) -> np.ndarray:
+def _complex_dtype(dtype: np.dtype) -> np.dtype:
     """
-    Implementação recursiva da FFT 1D usando o algoritmo Cooley-Tukey.
+    Retorna o tipo complexo usado para transformar dados do tipo dtype.
+    
+    Entradas em precisão simples (float32/complex64) permanecem em complex64,
+    o que reduz pela metade a memória e o tráfego dos buffers da FFT; os demais
+    tipos usam complex128.
+    """
+    if dtype in (np.float32, np.complex64):
+        return np.dtype(np.complex64)
+    return np.dtype(np.complex128)
+
+
+@functools.lru_cache(maxsize=64)
+def _twiddle_factors(n: int, dtype: np.dtype) -> np.ndarray:
+    """
+    Retorna os fatores de rotação W_n^k = exp(-2πik/n) para k = 0, ..., n/2 - 1.
+    
+    Os fatores dependem apenas do tamanho e do tipo, então são calculados uma única
+    vez e reutilizados por todas as transformadas de mesmo tamanho (cada etapa da
+    combinação e cada chunk do processamento em tempo real). O array retornado é
+    compartilhado e, por isso, somente leitura.
+    
+    Parâmetros:
+    -----------
+    n : int
+        Tamanho da transformada
+    dtype : dtype
+        Tipo complexo dos fatores (complex64 ou complex128)
+        
+    Retorna:
+    --------
+    out : ndarray
+        Array 1D com n // 2 fatores de rotação
+    """
+    w = np.exp(-2j * np.pi * np.arange(n // 2) / n).astype(dtype)
+    w.setflags(write=False)
+    return w
+
+
+# Tamanho das DFTs iniciais da FFT, calculadas por uma única multiplicação de
+# matrizes (executada pelo NumPy/BLAS em código vetorizado); sinais de até este
+# tamanho são transformados diretamente pela matriz da DFT
+_DFT_BASE_SIZE = 32
+
+
+@functools.lru_cache(maxsize=16)
+def _dft_matrix(n: int, dtype: np.dtype) -> np.ndarray:
+    """
+    Retorna a matriz da DFT de tamanho n: F[k, m] = exp(-2πikm/n).
+    
+    Usada nas DFTs iniciais da FFT: para n pequeno, X = F @ x é muito mais rápido
+    do que continuar dividindo o sinal em DFTs de tamanho 1. Assim como
+    os fatores de rotação, a matriz é calculada uma vez por tamanho e tipo e é
+    somente leitura.
+    
+    Parâmetros:
+    -----------
+    n : int
+        Tamanho da transformada
+    dtype : dtype
+        Tipo complexo da matriz (complex64 ou complex128)
+        
+    Retorna:
+    --------
+    out : ndarray
+        Matriz n x n da DFT
+    """
+    k = np.arange(n)
+    f = np.exp(-2j * np.pi * np.outer(k, k) / n).astype(dtype)
+    f.setflags(write=False)
+    return f
+
+
+def _fft_1d(x: np.ndarray) -> np.ndarray:
+    """
+    Calcula a FFT 1D ao longo da última dimensão.
+    
+    Arrays multi-dimensionais são transformados de uma vez: todas as linhas passam
+    juntas por cada etapa do algoritmo, sem laço Python sobre as linhas.
     
     Parâmetros:
     -----------
     x : ndarray
-        Array 1D complexo
+        Array complexo (pode ser multi-dimensional)
         
     Retorna:
     --------
     out : ndarray
-        Array 1D complexo com a FFT
+        Array complexo com a FFT aplicada ao longo da última dimensão
     """
-    n = len(x)
+    n = x.shape[-1]
     
-    # Caso base: se n é 1, retorna o próprio valor
-    if n == 1:
+    # Caso trivial: a FFT de um único ponto é o próprio valor
+    if n <= 1:
         return x.copy()
     
-    # Se n não é potência de 2, usa DFT direta (mais lento)
-    # ou pode usar zero-padding para potência de 2
+    # Para tamanhos pequenos, calcula a DFT diretamente com a matriz em cache
+    # (a matriz é simétrica, então x @ F aplica a DFT a cada linha de x)
+    if n <= _DFT_BASE_SIZE:
+        return x @ _dft_matrix(n, x.dtype)
+    
+    # Tamanhos que não são potência de 2 são convertidos em uma convolução de
+    # tamanho potência de 2 (algoritmo de Bluestein)
     if n & (n - 1) != 0:
-        # Não é potência de 2 - usa implementação iterativa mais eficiente
-        return _fft_radix2_iterative(x)
+        return _fft_bluestein(x)
     
-    # Divide e conquista: separa em pares e ímpares
-    even = _fft_1d_recursive(x[::2])   # FFT dos elementos pares
-    odd = _fft_1d_recursive(x[1::2])   # FFT dos elementos ímpares
+    return _fft_radix2(x)
+
+
+def _fft_radix2(x: np.ndarray) -> np.ndarray:
+    """
+    FFT de tamanho potência de 2 pelo algoritmo Cooley-Tukey (decimação no tempo),
+    na forma iterativa.
     
-    # Combina os resultados
-    # W_n^k = exp(-2πik/n) são os fatores de rotação (twiddle factors)
-    t = np.exp(-2j * np.pi * np.arange(n // 2) / n) * odd
+    O sinal é dividido em m = n / _DFT_BASE_SIZE subsequências x[r::m], cujas DFTs
+    são calculadas de uma vez por uma multiplicação com a matriz da DFT. Em seguida,
+    cada etapa combina as DFTs dos pares (r, r + m/2), que são as metades par e
+    ímpar de x[r::m/2], dobrando o tamanho das DFTs até restar uma só. Cada etapa
+    opera sobre todas as DFTs com poucas operações vetorizadas, alternando entre
+    dois buffers, em vez de uma chamada Python por subsequência.
     
-    # Combina: resultado = [even + t, even - t]
-    result = np.zeros(n, dtype=np.complex128)
-    result[:n//2] = even + t
-    result[n//2:] = even - t
+    Parâmetros:
+    -----------
+    x : ndarray
+        Array complexo com a última dimensão de tamanho potência de 2 (> _DFT_BASE_SIZE)
+        
+    Retorna:
+    --------
+    out : ndarray
+        Array complexo com a FFT aplicada ao longo da última dimensão
+    """
+    n = x.shape[-1]
+    batch = x.shape[:-1]
+    size = _DFT_BASE_SIZE
+    m = n // size
+    
+    # y[..., r, :] = DFT de x[r::m]; a linha r de x.reshape(size, m).T é x[r::m]
+    y = np.matmul(x.reshape(batch + (size, m)).swapaxes(-1, -2), _dft_matrix(size, x.dtype))
+    buf = np.empty_like(y)
+    
+    while m > 1:
+        half = m // 2
+        even = y[..., :half, :]  # DFTs de x[r::m], r < m/2
+        odd = y[..., half:, :]   # DFTs de x[r + m/2::m]
+        out = buf.reshape(batch + (half, 2 * size))
+        
+        # Combina: resultado = [even + t, even - t], com t = W_2size^k * odd
+        # (t é calculado diretamente na segunda metade do resultado)
+        t = out[..., size:]
+        np.multiply(odd, _twiddle_factors(2 * size, x.dtype), out=t)
+        np.add(even, t, out=out[..., :size])
+        np.subtract(even, t, out=t)
+        
+        y, buf = out, y
+        m = half
+        size *= 2
     
-    return result
+    return y.reshape(batch + (n,))
 
 
-def _fft_radix2_iterative(x: np.ndarray) -> np.ndarray:
+@functools.lru_cache(maxsize=16)
+def _bluestein_chirp(n: int, dtype: np.dtype):
     """
-    Implementação iterativa da FFT usando radix-2.
-    Mais eficiente para arrays que não são potência de 2.
+    Retorna os termos do algoritmo de Bluestein para tamanho n.
+    
+    Com c[m] = exp(-πim²/n), a DFT pode ser escrita como uma convolução:
+    X[k] = c[k] * Σ x[m] c[m] conj(c[k - m]). A convolução é calculada com FFTs
+    de tamanho potência de 2; a sequência conj(c) e sua FFT dependem apenas de n,
+    então são calculadas uma vez por tamanho e tipo (somente leitura).
     
     Parâmetros:
     -----------
-    x : ndarray
-        Array 1D complexo
+    n : int
+        Tamanho da transformada
+    dtype : dtype
+        Tipo complexo dos termos (complex64 ou complex128)
         
     Retorna:
     --------
-    out : ndarray
-        Array 1D complexo com a FFT
+    out : tuple
+        (c, B): chirp com n termos e FFT da sequência conj(c) circular
     """
-    n = len(x)
-    
-    # Se n é pequeno, usa DFT direta
-    if n <= 8:
-        return _dft_direct(x)
-    
-    # Encontra a próxima potência de 2 maior ou igual a n
-    next_power_of_2 = 1
-    while next_power_of_2 < n:
-        next_power_of_2 <<= 1
-    
-    # Preenche com zeros até a próxima potência de 2
-    if next_power_of_2 > n:
-        x_padded = np.zeros(next_power_of_2, dtype=np.complex128)
-        x_padded[:n] = x
-        # Calcula FFT da versão preenchida
-        fft_padded = _fft_1d_recursive(x_padded)
-        # Retorna apenas os primeiros n elementos
-        return fft_padded[:n]
-    else:
-        # Já é potência de 2
-        return _fft_1d_recursive(x)
+    m = np.arange(n)
+    # m² é reduzido módulo 2n antes da exponencial para não perder precisão
+    c = np.exp(-1j * np.pi * ((m * m) % (2 * n)) / n)
+    
+    size = next_fast_len(2 * n - 1)
+    b = np.zeros(size, dtype=np.complex128)
+    b[:n] = np.conj(c)
+    b[size - n + 1:] = np.conj(c[:0:-1])
+    
+    c = c.astype(dtype)
+    B = _fft_radix2(b).astype(dtype)
+    c.setflags(write=False)
+    B.setflags(write=False)
+    return c, B
 
 
-def _dft_direct(x: np.ndarray) -> np.ndarray:
+def _fft_bluestein(x: np.ndarray) -> np.ndarray:
     """
-    Implementação direta da DFT (Discrete Fourier Transform).
-    Usada para arrays pequenos ou quando a FFT não é aplicável.
+    FFT de tamanho arbitrário pelo algoritmo de Bluestein (chirp-z).
     
     Parâmetros:
     -----------
     x : ndarray
-        Array 1D complexo
+        Array complexo (a última dimensão pode ter qualquer tamanho)
         
     Retorna:
     --------
     out : ndarray
-        Array 1D complexo com a DFT
+        Array complexo com a FFT aplicada ao longo da última dimensão
     """
-    n = len(x)
-    k = np.arange(n)
-    result = np.zeros(n, dtype=np.complex128)
-    
-    # DFT: X[k] = sum(x[n] * exp(-2πikn/N))
-    for i in range(n):
-        result[i] = np.sum(x * np.exp(-2j * np.pi * i * k / n))
-    
+    n = x.shape[-1]
+    c, B = _bluestein_chirp(n, x.dtype)
+    size = B.shape[-1]
+    
+    a = np.zeros(x.shape[:-1] + (size,), dtype=x.dtype)
+    np.multiply(x, c, out=a[..., :n])
+    
+    # Convolução circular: IFFT(FFT(a) * B), com a IFFT pela conjugação
+    A = _fft_radix2(a)
+    A *= B
+    np.conjugate(A, out=A)
+    conv = _fft_radix2(A)[..., :n]
+    
+    # X[k] = c[k] * conv[k]; conj(conv) / size desfaz a conjugação da IFFT
+    result = np.conjugate(conv)
+    result *= c
+    result /= size
     return result
 
 
@@ -302,12 +368,244 @@ def fftfreq(n: int, d: float = 1.0) -> np.ndarray:
     f : ndarray
         Array com as frequências
     """
-    val = 1.0 / (n * d)
-    results = np.empty(n, dtype=np.float64)
-    N = (n - 1) // 2 + 1
-    p1 = np.arange(0, N, dtype=np.int32)
-    results[:N] = p1
-    p2 = np.arange(-(n // 2), 0, dtype=np.int32)
-    results[N:] = p2
-    return results * val
+    # Índices 0, 1, ..., n-1 em um único array; a segunda metade vira -(n//2), ..., -1
+    results = np.arange(n, dtype=np.float64)
+    results[(n - 1) // 2 + 1:] -= n
+    results *= 1.0 / (n * d)
+    return results
+
+
+
+def rfft(x: np.ndarray, n: Optional[int] = None, axis: int = -1, norm: Optional[str] = None,
+         out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Calcula a FFT de um sinal real, retornando apenas as frequências não negativas.
+    
+    Compatível com numpy.fft.rfft
+    
+    Como o espectro de um sinal real é hermitiano (X[-k] = conj(X[k])), basta
+    calcular n//2 + 1 bins. Para n par, as amostras pares e ímpares são empacotadas
+    em um único sinal complexo de tamanho n/2, cuja FFT é separada depois,
+    reduzindo o trabalho pela metade em relação a fft().
+    
+    Parâmetros:
+    -----------
+    x : array_like
+        Array de entrada real
+    n : int, opcional
+        Tamanho da FFT. Se n < x.shape[axis], x é truncado.
+        Se n > x.shape[axis], x é preenchido com zeros.
+        Se None, usa x.shape[axis]
+    axis : int, opcional
+        Eixo ao longo do qual calcular a FFT. Padrão é -1 (último eixo)
+    norm : str, opcional
+        Normalização: 'ortho' para normalização ortogonal, None para padrão
+    out : ndarray, opcional
+        Array complexo onde o resultado é escrito (evita alocar a saída, útil em
+        laços de tempo real que reutilizam o mesmo buffer)
+        
+    Retorna:
+    --------
+    out : ndarray
+        Array complexo com n//2 + 1 bins ao longo do eixo especificado
+    """
+    x = np.moveaxis(np.real(np.asarray(x)), axis, -1)
+    if x.dtype != np.float32:
+        x = x.astype(np.float64)
+    
+    if n is None:
+        n = x.shape[-1]
+    
+    # Trunca ou preenche com zeros até n amostras
+    if x.shape[-1] != n:
+        x_sized = np.zeros(x.shape[:-1] + (n,), dtype=x.dtype)
+        m = min(n, x.shape[-1])
+        x_sized[..., :m] = x[..., :m]
+        x = x_sized
+    
+    if n % 2 != 0:
+        # Tamanho ímpar: não é possível empacotar, usa a FFT complexa
+        result = fft(x)[..., :n // 2 + 1]
+        if out is not None:
+            np.copyto(np.moveaxis(out, axis, -1), result)
+            result = np.moveaxis(out, axis, -1)
+    else:
+        half = n // 2
+        # Empacota amostras pares na parte real e ímpares na parte imaginária:
+        # com o último eixo contíguo, os pares (x[2k], x[2k+1]) já estão na
+        # memória no formato de um número complexo, então basta reinterpretá-los
+        z = np.ascontiguousarray(x).view(_complex_dtype(x.dtype))
+        Z = _fft_1d(z)
+        
+        if out is not None:
+            result = np.moveaxis(out, axis, -1)
+        else:
+            result = np.empty(x.shape[:-1] + (half + 1,), dtype=Z.dtype)
+        
+        # Bin de Nyquist: com even[0] = Re(Z[0]) e odd[0] = Im(Z[0])
+        result[..., half] = Z[..., 0].real - Z[..., 0].imag
+        
+        # Z_mirror[k] = conj(Z[half - k]), com Z[half] = Z[0] (periodicidade)
+        Z_mirror = np.empty_like(Z)
+        Z_mirror[..., 0] = Z[..., 0]
+        Z_mirror[..., 1:] = Z[..., :0:-1]
+        np.conjugate(Z_mirror, out=Z_mirror)
+        
+        # result = even + twiddle * odd, com even = (Z + Z_mirror) / 2 e
+        # odd = -i (Z - Z_mirror) / 2; odd é calculado no lugar de Z_mirror
+        even = result[..., :half]
+        np.add(Z, Z_mirror, out=even)
+        even *= 0.5
+        odd = np.subtract(Z, Z_mirror, out=Z_mirror)
+        odd *= _twiddle_factors(n, Z.dtype)
+        odd *= -0.5j
+        even += odd
+    
+    if norm == 'ortho':
+        result /= np.sqrt(n)
+    
+    if out is not None:
+        return out
+    return np.moveaxis(result, -1, axis)
+
 
+def irfft(x: np.ndarray, n: Optional[int] = None, axis: int = -1, norm: Optional[str] = None,
+          out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Calcula a inversa de rfft(), retornando um sinal real.
+    
+    Compatível com numpy.fft.irfft
+    
+    Parâmetros:
+    -----------
+    x : array_like
+        Array complexo com as frequências não negativas (saída de rfft)
+    n : int, opcional
+        Tamanho do sinal de saída. Se None, usa 2 * (x.shape[axis] - 1)
+    axis : int, opcional
+        Eixo ao longo do qual calcular a IFFT
+    norm : str, opcional
+        Normalização: 'ortho' para normalização ortogonal, None para padrão
+    out : ndarray, opcional
+        Array real onde o resultado é escrito (evita alocar a saída, útil em
+        laços de tempo real que reutilizam o mesmo buffer)
+        
+    Retorna:
+    --------
+    out : ndarray
+        Array real com n amostras ao longo do eixo especificado
+    """
+    x = np.asarray(x)
+    x = np.moveaxis(x.astype(_complex_dtype(x.dtype), copy=False), axis, -1)
+    
+    if n is None:
+        n = 2 * (x.shape[-1] - 1)
+    if n < 1:
+        raise ValueError(f"Número inválido de pontos da FFT ({n})")
+    
+    # Trunca ou preenche com zeros até n//2 + 1 bins
+    n_bins = n // 2 + 1
+    if x.shape[-1] != n_bins:
+        x_sized = np.zeros(x.shape[:-1] + (n_bins,), dtype=x.dtype)
+        m = min(n_bins, x.shape[-1])
+        x_sized[..., :m] = x[..., :m]
+        x = x_sized
+    
+    if n % 2 != 0:
+        # Tamanho ímpar: reconstrói o espectro completo e usa a IFFT complexa
+        full = np.concatenate([x, np.conj(x[..., :0:-1])], axis=-1)
+        result = np.real(ifft(full))
+        if out is not None:
+            np.copyto(np.moveaxis(out, axis, -1), result)
+            result = np.moveaxis(out, axis, -1)
+    else:
+        half = n // 2
+        # Desfaz a separação feita em rfft(): recupera o espectro do sinal
+        # empacotado, z = even + i * odd, com even = (X + X_mirror) / 2 e
+        # odd = (X - X_mirror) * conj(twiddle) / 2 (odd calculado no lugar de X_mirror)
+        X_mirror = np.conj(x[..., half:0:-1])
+        z = np.add(x[..., :half], X_mirror)
+        odd = np.subtract(x[..., :half], X_mirror, out=X_mirror)
+        odd *= np.conj(_twiddle_factors(n, x.dtype))
+        odd *= 1j
+        z += odd
+        z *= 0.5
+        
+        # Como numpy, ignora a parte imaginária dos bins DC e Nyquist (que seria
+        # zero em um espectro hermitiano); só z[0] depende deles
+        dc = x[..., 0].real
+        nyquist = x[..., half].real
+        z[..., 0] = 0.5 * ((dc + nyquist) + 1j * (dc - nyquist))
+        
+        # IFFT de tamanho n/2 pela conjugação: ifft(z) = conj(FFT(conj(z))) / (n/2)
+        np.conjugate(z, out=z)
+        Z = _fft_1d(z)
+        if out is not None:
+            result = np.moveaxis(out, axis, -1)
+        else:
+            result = np.empty(x.shape[:-1] + (n,), dtype=Z.real.dtype)
+        
+        # Desempacota: amostras pares na parte real e ímpares na imaginária
+        if result.flags.c_contiguous and result.dtype == Z.real.dtype:
+            # Os pares (result[2k], result[2k+1]) são escritos como um complexo
+            packed = result.view(Z.dtype)
+            np.conjugate(Z, out=packed)
+            packed *= 1.0 / half
+        else:
+            result[..., ::2] = Z.real
+            result[..., 1::2] = Z.imag
+            result[..., 1::2] *= -1.0
+            result *= 1.0 / half
+    
+    if norm == 'ortho':
+        result *= np.sqrt(n)
+    
+    if out is not None:
+        return out
+    return np.moveaxis(result, -1, axis)
+
+
+def rfftfreq(n: int, d: float = 1.0) -> np.ndarray:
+    """
+    Retorna as frequências (não negativas) correspondentes aos bins de rfft().
+    
+    Compatível com numpy.fft.rfftfreq
+    
+    Parâmetros:
+    -----------
+    n : int
+        Tamanho da janela
+    d : float
+        Espaçamento da amostra (inverso da taxa de amostragem)
+        
+    Retorna:
+    --------
+    f : ndarray
+        Array com as n//2 + 1 frequências
+    """
+    return np.arange(n // 2 + 1, dtype=np.float64) / (n * d)
+
+
+def next_fast_len(n: int) -> int:
+    """
+    Retorna o menor tamanho >= n que a FFT calcula sem aproximações.
+    
+    O algoritmo Cooley-Tukey desta implementação trabalha com potências de 2;
+    outros tamanhos são calculados pelo algoritmo de Bluestein, que usa FFTs de
+    pelo menos o dobro do tamanho. Preencher o sinal com zeros até este valor
+    antes de filtrar no domínio da frequência evita esse custo extra.
+    
+    Parâmetros:
+    -----------
+    n : int
+        Tamanho mínimo desejado
+        
+    Retorna:
+    --------
+    out : int
+        Menor potência de 2 maior ou igual a n
+    """
+    fast_len = 1
+    while fast_len < n:
+        fast_len <<= 1
+    return fast_len
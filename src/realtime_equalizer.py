@@ -6,14 +6,15 @@ Suporta entrada de microfone ou arquivo de áudio.
 
 import numpy as np
 import pyaudio
+from scipy import signal
 import threading
-import time
 import tkinter as tk
 from tkinter import messagebox, filedialog
-from equalizer import create_frequency_filter, calculate_cutoff_frequencies
+from equalizer import create_filter_bank, calculate_cutoff_frequencies, peaking_sos
 from spectrum_analyzer import SpectrumAnalyzer
-from fft import fft, ifft
+from fft import rfft, irfft, next_fast_len
 import librosa
+import soundfile as sf
 import os
 
 
@@ -23,41 +24,122 @@ class RealTimeEqualizer:
     Cada banda é filtrada e amplificada/atenuada conforme ganho em dB.
     """
     
-    def __init__(self, sample_rate=44100, chunk_size=1024):
+    def __init__(self, sample_rate=44100, chunk_size=1024, processing_mode='fft', frames_per_fft=1):
         """
         Inicializa o equalizador em tempo real.
         
         Args:
             sample_rate: Taxa de amostragem (Hz) - padrão: 44100
             chunk_size: Tamanho do bloco de processamento - padrão: 1024
+            processing_mode: 'fft' (filtros no domínio da frequência com overlap-save)
+                             ou 'biquad' (cascata de filtros peaking IIR, sem latência de bloco)
+            frames_per_fft: Número de chunks processados por FFT no modo 'fft' - padrão: 1.
+                            Valores maiores reduzem o número de FFTs por segundo e melhoram
+                            a resolução em baixas frequências, ao custo de mais latência.
+                            Com hop_size = chunk_size * frames_per_fft e
+                            fft_size = next_fast_len(2 * hop_size), a latência do modo
+                            'fft' é fft_size - (fft_size - hop_size) // 2 - chunk_size
+                            amostras (ex.: chunk_size=1024 → 512 amostras com
+                            frames_per_fft=1 e 2048 com frames_per_fft=2)
         """
+        if processing_mode not in ('fft', 'biquad'):
+            raise ValueError("processing_mode deve ser 'fft' ou 'biquad'")
+        if frames_per_fft < 1:
+            raise ValueError("frames_per_fft deve ser maior ou igual a 1")
+        
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
+        self.processing_mode = processing_mode
+        self.frames_per_fft = frames_per_fft
         
         # Frequências centrais das 5 bandas (Hz)
         self.center_frequencies = [100, 330, 1000, 3300, 10000]
         
         # Ganhos em dB para cada banda (inicialmente 0 dB = sem alteração)
-        self.gains_db = [0.0] * len(self.center_frequencies)
+        # Armazenados em um array para que a conversão dB → linear seja vetorizada
+        self.gains_db = np.zeros(len(self.center_frequencies))
+        
+        # Amplificação linear de cada banda (A_i = 10^(AdB/20)), atualizada apenas
+        # quando um ganho muda, para que a conversão não seja refeita no processamento
+        self.gains_linear = np.ones(len(self.center_frequencies))
         
         # Forma do filtro ('gaussian' ou 'rectangular')
         self.filter_shape = 'sinc'
         
         # Pré-calcula os filtros no domínio da frequência para cada banda
-        # Usa um tamanho de FFT maior que o chunk para melhor resolução
-        self.fft_size = chunk_size * 2  # Tamanho da FFT (pode ser ajustado)
+        # Usa um tamanho de FFT maior que o bloco processado (frames_per_fft chunks)
+        # para melhor resolução, arredondado para um tamanho que a FFT calcula sem
+        # aproximações (potência de 2)
+        self.hop_size = chunk_size * frames_per_fft  # Tamanho do avanço por FFT
+        self.fft_size = next_fast_len(self.hop_size * 2)
         self.band_filters_fft = []
         self._precompute_filters()
         
-        # Buffer para processamento com overlap-add
-        # Usa um buffer deslizante para acumular chunks antes de processar
-        self.input_buffer = np.zeros(self.fft_size, dtype=np.float32)
-        self.output_buffer = np.zeros(self.fft_size, dtype=np.float32)
-        self.hop_size = chunk_size  # Tamanho do avanço (igual ao chunk)
+        # Filtro combinado publicado como uma tupla (filtro, é_identidade): a thread da
+        # interface constrói cada novo filtro em um array próprio e publica a tupla em
+        # uma única atribuição; a thread de áudio lê a referência uma vez por janela,
+        # sem locks, e nunca vê um filtro escrito pela metade nem um indicador de
+        # identidade de outro filtro. O filtro combinado é real, então float32 é suficiente
+        # A FFT real tem apenas fft_size // 2 + 1 bins
+        self.n_bins = self.fft_size // 2 + 1
+        self._combined_filter = (np.ones(self.n_bins, dtype=np.float32), True)
+        self._band_weights = np.zeros(len(self.center_frequencies), dtype=np.float32)
+        
+        # Modo 'biquad': uma seção SOS por banda e o estado dos filtros (zi),
+        # mantido entre chunks para que a filtragem seja contínua
+        self._sos = None
+        self._sos_zi = np.zeros((len(self.center_frequencies), 2))
+        
+        # Buffer para processamento com overlap-save
+        # As entradas são acumuladas em um buffer circular com espaço para vários
+        # chunks: cada chunk novo é escrito após o anterior e input_buffer é uma view
+        # das últimas fft_size amostras. Só quando o buffer enche as amostras ainda
+        # necessárias são copiadas para o início (em vez de deslocar a cada chunk)
+        self._input_ring = np.zeros(self.fft_size + 8 * self.hop_size, dtype=np.float32)
+        self._ring_pos = self.fft_size
+        self.input_buffer = self._input_ring[:self.fft_size]
+        
+        # Overlap-save: da janela filtrada (convolução circular) só são mantidas as
+        # hop_size amostras centrais. Os filtros têm fase zero e resposta ao impulso
+        # de no máximo fft_size // 2 amostras, então essas amostras não sofrem aliasing
+        # circular e não há cauda a somar com o próximo chunk
+        self._ols_offset = (self.fft_size - self.hop_size) // 2
+        
+        # Bloco de saída da última FFT (hop_size amostras), entregue um chunk por chamada.
+        # Com frames_per_fft > 1, a FFT só é executada a cada frames_per_fft chunks
+        self._ols_block = np.zeros(self.hop_size, dtype=np.float32)
+        self._frames_pending = 0
+        self._block_index = 0
+        
+        # Buffers de trabalho pré-alocados, reutilizados a cada chunk (o callback de
+        # áudio não aloca arrays): espectro, saída da IFFT e cópia para o analisador
+        self._audio_fft = np.empty(self.n_bins, dtype=np.complex64)
+        self._filtered_audio = np.empty(self.fft_size, dtype=np.float32)
+        self._spectrum_chunk = np.empty(self.chunk_size, dtype=np.float32)
+        
+        # Contador de janelas para o print de depuração em _filter_window_fft
+        self._dbg_tick = 0
+        
+        # Constrói os filtros para os ganhos iniciais (0 dB)
+        self._update_filters()
         
         # Estado do processamento
         self.is_processing = False
         self.audio_stream = None
+        self.playback_thread = None
+        
+        # Fila circular (um produtor, um consumidor) entre a thread de reprodução de
+        # arquivo e o callback do PyAudio, com capacidade para _ring_chunks chunks
+        # decodificados; o processamento é feito no próprio callback. Cada contador
+        # tem um único escritor (head: produtor, tail: callback), então a fila
+        # dispensa locks; o evento acorda o produtor quando o callback libera espaço
+        self._ring_chunks = 8
+        self._file_ring = np.zeros(self._ring_chunks * self.chunk_size, dtype=np.float32)
+        self._ring_head = 0
+        self._ring_tail = 0
+        self._ring_space = threading.Event()
+        self._callback_buf = np.zeros(self.chunk_size, dtype=np.float32)
+        self._silence = np.zeros(self.chunk_size, dtype=np.float32)
         
         # Buffer para análise de espectro (último chunk processado)
         self.last_processed_chunk = None
@@ -65,36 +147,26 @@ class RealTimeEqualizer:
         
     def _precompute_filters(self):
         """
-        Pré-calcula os filtros passa-banda no domínio da frequência usando create_frequency_filter.
+        Pré-calcula os filtros passa-banda no domínio da frequência usando create_filter_bank.
         As frequências de corte são calculadas no meio entre as frequências centrais das bandas,
         conforme especificação do projeto.
-        """
-        self.band_filters_fft = []
-        self.cutoff_frequencies = []  # Armazena as frequências de corte
         
+        Cada filtro tem fft_size // 2 + 1 bins (o espectro de rfft do buffer de entrada).
+        """
         # Calcula as frequências de corte que ficam no meio entre as frequências centrais
-        cutoff_freqs = calculate_cutoff_frequencies(self.center_frequencies, self.sample_rate)
-        
-        for i, center_freq in enumerate(self.center_frequencies):
-            low_cutoff, high_cutoff = cutoff_freqs[i]
-            self.cutoff_frequencies.append((low_cutoff, high_cutoff))
-            
-            # Calcula largura de banda efetiva
-            bandwidth = high_cutoff - low_cutoff
-            
-            # Usa create_frequency_filter do equalizer.py com frequências de corte específicas
-            filter_response = create_frequency_filter(
-                self.fft_size, 
-                self.sample_rate, 
-                center_freq, 
-                bandwidth=bandwidth,  # Mantido para compatibilidade
-                low_cutoff=low_cutoff,
-                high_cutoff=high_cutoff,
-                filter_shape=self.filter_shape
-            )
-            
-            # Armazena o filtro no domínio da frequência
-            self.band_filters_fft.append(filter_response)
+        self.cutoff_frequencies = calculate_cutoff_frequencies(self.center_frequencies, self.sample_rate)
+        
+        # Usa create_filter_bank do equalizer.py (create_frequency_filter com as frequências
+        # de corte de cada banda), que já devolve os filtros empilhados em um único array
+        # contíguo (n_bandas, fft_size // 2 + 1), para que a combinação das bandas possa ser
+        # feita de forma vetorizada. Os filtros são reais, então float32 basta (o espectro é complex64)
+        self.band_filters_fft = create_filter_bank(
+            self.fft_size,
+            self.sample_rate,
+            self.center_frequencies,
+            self.cutoff_frequencies,
+            filter_shape=self.filter_shape
+        ).astype(np.float32, copy=False)
         
         print(f"Filtros pré-calculados para {len(self.center_frequencies)} bandas")
         print(f"Frequências centrais: {self.center_frequencies} Hz")
@@ -111,10 +183,42 @@ class RealTimeEqualizer:
             band_index: Índice da banda (0-4)
             gain_db: Ganho em dB (positivo = amplificação, negativo = atenuação)
         """
-        if 0 <= band_index < len(self.center_frequencies):
+        self.set_band_gains({band_index: gain_db})
+    
+    def set_band_gains(self, gains):
+        """
+        Define o ganho em dB de várias bandas de uma vez, reconstruindo o filtro
+        uma única vez (use para aplicar todas as mudanças de um evento da interface).
+        
+        Args:
+            gains: Dicionário {índice da banda: ganho em dB}
+        """
+        n_bands = len(self.center_frequencies)
+        for band_index in gains:
+            if not 0 <= band_index < n_bands:
+                raise ValueError(f"Índice de banda deve estar entre 0 e {n_bands - 1}")
+        
+        for band_index, gain_db in gains.items():
             self.gains_db[band_index] = gain_db
+            self.gains_linear[band_index] = self._db_to_linear(gain_db)
+        # Reconstrói o filtro aqui, fora da thread de áudio
+        self._update_filters()
+    
+    def _update_filters(self):
+        """
+        Reconstrói o filtro do modo de processamento atual para os ganhos atuais.
+        
+        No modo 'fft', o filtro combinado é escrito em um array novo e publicado
+        junto com o indicador de filtro neutro em uma única atribuição. No modo
+        'biquad', as novas seções substituem as anteriores em uma única atribuição.
+        """
+        if self.processing_mode == 'biquad':
+            self._sos = self._create_peaking_sos()
         else:
-            raise ValueError(f"Índice de banda deve estar entre 0 e {len(self.center_frequencies) - 1}")
+            combined_filter = self._create_combined_filter(
+                np.empty(self.n_bins, dtype=np.float32))
+            # Com todas as bandas em 0 dB o filtro combinado é exatamente 1.0
+            self._combined_filter = (combined_filter, not self._band_weights.any())
     
     def _db_to_linear(self, gain_db):
         """
@@ -123,106 +227,222 @@ class RealTimeEqualizer:
         Fórmula: A = 10^(AdB/20)
         
         Args:
-            gain_db: Ganho em dB
+            gain_db: Ganho em dB (escalar ou array)
             
         Returns:
             Amplificação linear
         """
         return 10.0 ** (gain_db / 20.0)
     
-    def process_chunk(self, audio_chunk):
+    def _create_combined_filter(self, out):
         """
-        Processa um bloco de áudio aplicando o equalizador usando FFT.
+        Combina os filtros das bandas em um único filtro paramétrico.
         
-        Aplica a equação: y[n] = sum_{i=1}^{5} A_i * (x[n] * h_i[n])
-        onde A_i é a amplificação linear calculada a partir do ganho em dB.
-        A_i = 10^(AdB/20)
+        Quando gain_db = 0, o filtro não altera o sinal (resposta = 1.0)
+        Quando gain_db > 0, amplifica aquela banda
+        Quando gain_db < 0, atenua aquela banda
+        O filtro é real (não complexo) pois os filtros de frequência são reais.
         
-        Usa create_frequency_filter do equalizer.py, como em multi_band_equalizer.py.
-        Processa em blocos usando FFT com overlap-add para processamento em tempo real.
+        Como cada banda contribui com filter_response * (gain_linear - 1.0), a soma
+        das bandas é um produto matriz-vetor entre os filtros empilhados e os pesos
+        das bandas, calculado com np.dot diretamente no buffer float32 pré-alocado.
+        
+        Args:
+            out: Buffer float32 com fft_size // 2 + 1 bins que recebe o filtro
+        
+        Returns:
+            Array com o filtro combinado no domínio da frequência
+        """
+        # Amplificação linear já convertida em set_band_gains: A_i = 10^(AdB/20)
+        gains_linear = self.gains_linear
+        
+        # Boost: eq_response = 1.0 + filter_response * (gain_linear - 1.0)
+        # Cut:   eq_response = 1.0 - filter_response * (1.0 - gain_linear)
+        # As duas formas são equivalentes, então um único peso por banda atende ambos.
+        # Quando gain_db é muito negativo (ex: -30 dB), gain_linear ≈ 0.032
+        # Isso resulta em atenuação de ~97%, tornando a banda praticamente inaudível
+        weights = self._band_weights
+        np.subtract(gains_linear, 1.0, out=weights, casting='same_kind')
+        
+        # Se o ganho for 0 dB, não altera nada (peso zero para esta banda)
+        weights[np.abs(self.gains_db) < 0.001] = 0.0  # Praticamente zero
+        
+        combined_filter = np.dot(weights, self.band_filters_fft, out=out)
+        combined_filter += 1.0
+        
+        # Headroom fixo: se alguma frequência for amplificada acima de 0 dB, escala o
+        # filtro inteiro para que o pico da resposta seja 1.0. Assim não é preciso
+        # normalizar cada chunk (o que produziria um ganho variando no tempo)
+        peak = max(combined_filter.max(), -combined_filter.min())
+        if peak > 1.0:
+            combined_filter *= 1.0 / peak
+        
+        return combined_filter
+    
+    def _create_peaking_sos(self):
+        """
+        Projeta um filtro peaking (biquad) por banda, conforme o RBJ Audio EQ Cookbook
+        (peaking_sos do equalizer.py).
+        
+        Cada banda usa a sua frequência central e Q = f0 / (f_high - f_low),
+        com as frequências de corte calculadas em _precompute_filters.
+        Com gain_db = 0 a seção se reduz a b = a (resposta unitária).
+        
+        Returns:
+            Array (n_bandas, 6) no formato SOS do scipy.signal
+        """
+        f0 = np.asarray(self.center_frequencies, dtype=np.float64)
+        band_edges = np.asarray(self.cutoff_frequencies, dtype=np.float64)
+        q = f0 / (band_edges[:, 1] - band_edges[:, 0])
+        sos = peaking_sos(self.sample_rate, f0, self.gains_db, q)
+        
+        # Headroom fixo: escala a primeira seção para que o pico da resposta em
+        # frequência da cascata não passe de 1.0 (0 dB)
+        _, response = signal.sosfreqz(sos, worN=4096)
+        sos[0, :3] /= max(1.0, np.abs(response).max())
+        return sos
+    
+    def _filter_chunk_biquad(self, audio_chunk):
+        """
+        Filtra um chunk com a cascata de biquads, mantendo o estado entre chunks.
+        
+        O custo é O(chunk_size) por chunk e não há latência de bloco.
         
         Args:
             audio_chunk: Array numpy com amostras de áudio (mono)
             
         Returns:
-            Áudio processado
+            Áudio filtrado
         """
-        if len(audio_chunk) == 0:
-            return audio_chunk
+        # As seções são reprojetadas em set_band_gains; o estado zi é mantido
+        output, self._sos_zi = signal.sosfilt(self._sos, audio_chunk, zi=self._sos_zi)
+        return output.astype(np.float32, copy=False)
+    
+    def _filter_chunk_fft(self, audio_chunk):
+        """
+        Filtra um chunk no domínio da frequência usando FFT com overlap-save.
         
-        # Adiciona o novo chunk ao buffer de entrada (deslizante)
-        # Move o buffer para a esquerda e adiciona o novo chunk no final
-        self.input_buffer[:-self.hop_size] = self.input_buffer[self.hop_size:]
-        self.input_buffer[-self.hop_size:] = audio_chunk
-        
-        # Cria o filtro combinado usando abordagem paramétrica
-        # Quando gain_db = 0, o filtro não altera o sinal (resposta = 1.0)
-        # Quando gain_db > 0, amplifica aquela banda
-        # Quando gain_db < 0, atenua aquela banda
-        # O filtro é real (não complexo) pois os filtros de frequência são reais
-        combined_filter = np.ones(self.fft_size, dtype=np.float64)
-        
-        for i, filter_response in enumerate(self.band_filters_fft):
-            # Converte ganho em dB para amplificação linear: A_i = 10^(AdB/20)
-            gain_db = self.gains_db[i]
-            
-            # Se o ganho for 0 dB, não altera nada (pula esta banda)
-            if abs(gain_db) < 0.001:  # Praticamente zero
-                continue
-            
-            gain_linear = self._db_to_linear(gain_db)
+        Args:
+            audio_chunk: Array numpy com amostras de áudio (mono)
             
-            # Aplica o ganho usando abordagem paramétrica
-            # Para boost: adiciona o sinal filtrado amplificado
-            # Para cut: reduz o sinal filtrado
-            # Quando gain_db é muito negativo (ex: -30 dB), gain_linear ≈ 0.032
-            # Isso resulta em atenuação de ~97%, tornando a banda praticamente inaudível
-            if gain_db > 0:
-                # Boost: eq_response = 1.0 + filter_response * (gain_linear - 1.0)
-                combined_filter += filter_response * (gain_linear - 1.0)
-            else:
-                # Cut: eq_response = 1.0 - filter_response * (1.0 - gain_linear)
-                # Para valores muito negativos, isso resulta em atenuação quase total
-                combined_filter -= filter_response * (1.0 - gain_linear)
+        Returns:
+            Áudio filtrado
+        """
+        # Adiciona o novo chunk ao buffer de entrada (circular)
+        chunk_size = self.chunk_size
+        ring = self._input_ring
+        pos = self._ring_pos
+        if pos + chunk_size > len(ring):
+            # Buffer cheio: mantém apenas as amostras que ainda entram na próxima janela
+            keep = self.fft_size - chunk_size
+            ring[:keep] = ring[pos - keep:pos]
+            pos = keep
+        ring[pos:pos + chunk_size] = audio_chunk
+        pos += chunk_size
+        self._ring_pos = pos
+        self.input_buffer = ring[pos - self.fft_size:pos]
+        
+        # Executa a FFT apenas quando frames_per_fft chunks novos foram acumulados;
+        # nas demais chamadas entrega o próximo chunk do último bloco filtrado
+        self._frames_pending += 1
+        if self._frames_pending == self.frames_per_fft:
+            self._ols_block = self._filter_window_fft()
+            self._frames_pending = 0
+            self._block_index = 0
+        
+        start = self._block_index * chunk_size
+        self._block_index += 1
+        return self._ols_block[start:start + chunk_size]
+    
+    def _filter_window_fft(self):
+        """
+        Filtra a janela atual do buffer de entrada (fft_size amostras) com overlap-save.
+        
+        Returns:
+            As hop_size amostras centrais da janela filtrada
+        """
+        offset = self._ols_offset
         
-        # Converte o sinal do buffer para o domínio da frequência
-        audio_fft = fft(self.input_buffer)
+        # Filtro combinado (paramétrico) construído em set_band_gains, lido uma única
+        # vez: filtro e indicador de identidade pertencem sempre à mesma publicação
+        combined_filter, is_identity = self._combined_filter
+        
+        # Filtro neutro (todas as bandas em 0 dB): a IFFT devolveria a própria janela,
+        # então copia as amostras centrais sem FFT. O buffer de entrada continua sendo
+        # atualizado a cada chunk, e a saída mantém o mesmo atraso do caminho com FFT
+        if is_identity:
+            filtered_block = self._filtered_audio[offset:offset + self.hop_size]
+            np.copyto(filtered_block, self.input_buffer[offset:offset + self.hop_size])
+            return filtered_block
+        
+        # Converte o sinal do buffer para o domínio da frequência (FFT real)
+        audio_fft = rfft(self.input_buffer, out=self._audio_fft)
         
         # Aplica o filtro combinado: Y[k] = X[k] * H[k]
         # onde H[k] é o filtro paramétrico combinado
-        # Multiplica elemento por elemento (NumPy faz casting automático de real para complex)
-        filtered_fft = audio_fft * combined_filter
+        # Multiplica elemento por elemento, no próprio espectro (real x complexo)
+        audio_fft *= combined_filter
         
         # Debug: mostra estatísticas do filtro (apenas ocasionalmente para não poluir o console)
-        if np.random.random() < 0.01:  # 1% das vezes
-            print(f"Filtro - Min: {np.min(combined_filter):.3f}, Max: {np.max(combined_filter):.3f}, Mean: {np.mean(combined_filter):.3f}")
+        # Desativado ao executar com python -O
+        if __debug__:
+            self._dbg_tick += 1
+            if self._dbg_tick >= 100:  # 1 a cada 100 janelas
+                self._dbg_tick = 0
+                print(f"Filtro - Min: {np.min(combined_filter):.3f}, Max: {np.max(combined_filter):.3f}, Mean: {np.mean(combined_filter):.3f}")
         
         # Converte de volta para o domínio do tempo
-        filtered_audio = np.real(ifft(filtered_fft))
+        # (espectro complex64 -> sinal float32, o mesmo tipo do buffer de entrada)
+        filtered_audio = irfft(audio_fft, n=self.fft_size, out=self._filtered_audio)
+        
+        # Overlap-save: mantém apenas as amostras centrais, livres de aliasing circular
+        # (view do buffer de saída da IFFT, sem cópia)
+        return filtered_audio[offset:offset + self.hop_size]
+    
+    def process_chunk(self, audio_chunk):
+        """
+        Processa um bloco de áudio aplicando o equalizador.
         
-        # Converte para o tipo do buffer de entrada para preservar precisão
-        filtered_audio = filtered_audio.astype(self.input_buffer.dtype)
+        Aplica a equação: y[n] = sum_{i=1}^{5} A_i * (x[n] * h_i[n])
+        onde A_i é a amplificação linear calculada a partir do ganho em dB.
+        A_i = 10^(AdB/20)
         
-        # Aplica overlap-add: adiciona a parte de overlap do buffer de saída anterior
-        output = filtered_audio[:self.hop_size] + self.output_buffer[:self.hop_size]
+        No modo 'fft', usa create_frequency_filter do equalizer.py, como em
+        multi_band_equalizer.py, processando em blocos com overlap-save.
+        No modo 'biquad', usa uma cascata de filtros peaking IIR (scipy.signal.sosfilt).
         
-        # Salva a parte de overlap para o próximo chunk
-        self.output_buffer[:-self.hop_size] = filtered_audio[self.hop_size:]
-        self.output_buffer[-self.hop_size:] = 0
+        Args:
+            audio_chunk: Array numpy com amostras de áudio (mono)
+            
+        Returns:
+            Áudio processado. O array pode ser um buffer interno reutilizado na
+            próxima chamada; copie-o se precisar mantê-lo.
+        """
+        if len(audio_chunk) == 0:
+            return audio_chunk
         
-        # Normaliza para evitar clipping (apenas se necessário)
-        max_val = np.max(np.abs(output))
-        if max_val > 1.0:
-            output = output / max_val
+        if self.processing_mode == 'biquad':
+            output = self._filter_chunk_biquad(audio_chunk)
         else:
-            # Garante que o tipo de dados seja preservado
-            output = output.astype(self.input_buffer.dtype)
+            output = self._filter_chunk_fft(audio_chunk)
+        
+        # Todo o caminho de processamento é float32 (sem cópias de conversão de tipo)
+        output = output.astype(np.float32, copy=False)
+        
+        # O headroom já está no filtro; aqui apenas limita eventuais picos residuais
+        # (sem normalizar o chunk, o que variaria o ganho a cada bloco)
+        np.clip(output, -1.0, 1.0, out=output)
         
         # Armazena o chunk processado para análise de espectro
+        # (copiado para um buffer fixo; get_last_processed_chunk devolve uma cópia)
         with self.spectrum_lock:
-            self.last_processed_chunk = output.copy()
+            if output.shape == self._spectrum_chunk.shape:
+                np.copyto(self._spectrum_chunk, output)
+                self.last_processed_chunk = self._spectrum_chunk
+            else:
+                self.last_processed_chunk = output.copy()
         
-        return output.astype(np.float32)
+        return output
     
     def start_processing(self, input_device=None, output_device=None, audio_file=None):
         """
@@ -236,25 +456,26 @@ class RealTimeEqualizer:
         if self.is_processing:
             return
         
+        # Uma thread de reprodução que parou sozinha (erro de leitura) pode ainda
+        # estar fechando o seu arquivo
+        if self.playback_thread is not None:
+            self.playback_thread.join(timeout=2.0)
+            self.playback_thread = None
+        
         self.is_processing = True
         self.audio_file = audio_file
         self.audio_data = None
         self.audio_index = 0
-        self.audio_lock = threading.Lock()
+        self._restart_requested = False
+        self._ring_head = 0
+        self._ring_tail = 0
         
-        # Se um arquivo foi fornecido, carrega o áudio
+        # Se um arquivo foi fornecido, abre o áudio
+        self._sfile = None
         if audio_file:
             try:
                 print(f"Carregando arquivo: {audio_file}")
-                self.audio_data, file_sr = librosa.load(audio_file, sr=None, mono=True)
-                
-                # Se a taxa de amostragem for diferente, resampleia
-                if file_sr != self.sample_rate:
-                    print(f"Resampleando de {file_sr} Hz para {self.sample_rate} Hz")
-                    self.audio_data = librosa.resample(self.audio_data, orig_sr=file_sr, target_sr=self.sample_rate)
-                
-                self.audio_index = 0
-                print(f"Áudio carregado: {len(self.audio_data) / self.sample_rate:.2f} segundos")
+                self._open_audio_file(audio_file)
             except Exception as e:
                 print(f"Erro ao carregar arquivo: {e}")
                 self.is_processing = False
@@ -263,7 +484,8 @@ class RealTimeEqualizer:
         # Inicializa PyAudio
         self.p = pyaudio.PyAudio()
         
-        # Abre stream de áudio
+        # Abre stream de áudio, sempre em modo callback: todo o processamento roda na
+        # thread do PortAudio, com a entrada vinda do microfone ou da fila do arquivo
         # Se usar arquivo, não precisa de input
         self.audio_stream = self.p.open(
             format=pyaudio.paFloat32,
@@ -274,70 +496,166 @@ class RealTimeEqualizer:
             frames_per_buffer=self.chunk_size,
             input_device_index=input_device if audio_file is None else None,
             output_device_index=output_device,
-            stream_callback=self._audio_callback if audio_file is None else None
+            stream_callback=self._audio_callback,
+            start=False
         )
         
-        # Inicia o stream
-        self.audio_stream.start_stream()
-        
         if audio_file:
-            # Para arquivo, usa thread separada para alimentar o stream
+            # Para arquivo, uma thread separada decodifica os chunks e enche a fila;
+            # o stream só começa depois, para que o primeiro callback já encontre áudio
             self.playback_thread = threading.Thread(target=self._playback_loop, daemon=True)
             self.playback_thread.start()
         
+        # Inicia o stream
+        self.audio_stream.start_stream()
+        
         print("Processamento em tempo real iniciado")
     
+    def _open_audio_file(self, audio_file):
+        """
+        Prepara a leitura do arquivo de áudio para o loop de reprodução.
+        
+        Quando o soundfile consegue abrir o arquivo e a taxa de amostragem já é a do
+        equalizador, o áudio é decodificado sob demanda, um chunk por vez, sem manter
+        o arquivo inteiro em memória. Caso contrário (formato não suportado pelo
+        libsndfile ou resampling necessário), o arquivo é carregado inteiro com librosa.
+        """
+        try:
+            sfile = sf.SoundFile(audio_file)
+        except RuntimeError:
+            sfile = None
+        
+        if sfile is not None and sfile.samplerate == self.sample_rate:
+            self._sfile = sfile
+            # Buffers de leitura reutilizados: bloco (amostras, canais) e chunk mono
+            self._file_block = np.zeros((self.chunk_size, sfile.channels), dtype=np.float32)
+            self._file_chunk = np.zeros(self.chunk_size, dtype=np.float32)
+            print(f"Áudio aberto: {sfile.frames / sfile.samplerate:.2f} segundos (leitura em blocos)")
+            return
+        
+        if sfile is not None:
+            sfile.close()
+        
+        self.audio_data, file_sr = librosa.load(audio_file, sr=None, mono=True)
+        
+        # Se a taxa de amostragem for diferente, resampleia
+        if file_sr != self.sample_rate:
+            print(f"Resampleando de {file_sr} Hz para {self.sample_rate} Hz")
+            self.audio_data = librosa.resample(self.audio_data, orig_sr=file_sr, target_sr=self.sample_rate)
+        
+        # Preenche com zeros até um múltiplo de chunk_size, para que todo
+        # chunk lido no loop de reprodução tenha tamanho completo
+        pad = (-len(self.audio_data)) % self.chunk_size
+        self.audio_data = np.pad(self.audio_data, (0, pad)).astype(np.float32, copy=False)
+        
+        self.audio_index = 0
+        print(f"Áudio carregado: {len(self.audio_data) / self.sample_rate:.2f} segundos")
+    
+    def _next_file_chunk(self, sfile):
+        """
+        Devolve o próximo chunk mono (chunk_size amostras) do arquivo, voltando ao
+        início ao chegar ao fim. O array devolvido é reutilizado na chamada seguinte.
+        
+        Args:
+            sfile: SoundFile aberto pela sessão da thread de reprodução, ou None
+                   para o áudio carregado em memória
+        """
+        if self._restart_requested:
+            self._restart_requested = False
+            self.audio_index = 0
+            if sfile is not None:
+                sfile.seek(0)
+        
+        if sfile is None:
+            # Áudio em memória: sempre completo, pois foi preenchido até um múltiplo
+            # de chunk_size
+            audio_chunk = self.audio_data[self.audio_index:self.audio_index + self.chunk_size]
+            self.audio_index = (self.audio_index + self.chunk_size) % len(self.audio_data)
+            return audio_chunk
+        
+        # Leitura em blocos: o último bloco do arquivo é completado com zeros
+        n_read = len(sfile.read(dtype='float32', always_2d=True, out=self._file_block))
+        if n_read < self.chunk_size:
+            self._file_block[n_read:] = 0
+        if sfile.tell() >= sfile.frames:
+            sfile.seek(0)
+        
+        # Converte para mono pela média dos canais
+        if self._file_block.shape[1] == 1:
+            np.copyto(self._file_chunk, self._file_block[:, 0])
+        else:
+            np.mean(self._file_block, axis=1, out=self._file_chunk)
+        return self._file_chunk
+    
     def _audio_callback(self, in_data, frame_count, time_info, status):
         """
-        Callback chamado pelo PyAudio para cada bloco de áudio (apenas para microfone).
+        Callback chamado pelo PyAudio para cada bloco de áudio.
+        
+        Com microfone, processa o bloco recebido; com arquivo, consome um chunk da
+        fila preenchida por _playback_loop e o processa.
         """
         if not self.is_processing:
             return (None, pyaudio.paComplete)
         
-        # Converte bytes para array numpy
-        audio_data = np.frombuffer(in_data, dtype=np.float32)
+        if self.audio_file is None:
+            # Interpreta os bytes como array numpy (view, sem cópia)
+            audio_data = np.frombuffer(in_data, dtype=np.float32)
+        elif self._ring_head == self._ring_tail:
+            # Fila vazia (o produtor atrasou): entrega silêncio em vez de bloquear
+            return (self._silence, pyaudio.paContinue)
+        else:
+            # Copia o chunk antes de liberar a posição, pois o produtor pode sobrescrevê-la
+            start = (self._ring_tail % self._ring_chunks) * self.chunk_size
+            audio_data = self._callback_buf
+            np.copyto(audio_data, self._file_ring[start:start + self.chunk_size])
+            self._ring_tail += 1
+            self._ring_space.set()
         
         # Processa o bloco de áudio
         processed_audio = self.process_chunk(audio_data)
         
-        # Converte de volta para bytes
-        output_data = processed_audio.tobytes()
-        
-        return (output_data, pyaudio.paContinue)
+        # O PyAudio aceita qualquer objeto com buffer protocol somente leitura no
+        # retorno: devolve o array float32 contíguo diretamente, sem tobytes()
+        return (processed_audio, pyaudio.paContinue)
     
     def _playback_loop(self):
         """
         Loop de reprodução para arquivo de áudio (executado em thread separada).
+        Decodifica os chunks do arquivo e os coloca na fila lida por _audio_callback.
         """
+        # Em Linux, tenta dar prioridade de tempo real (SCHED_FIFO) a esta thread, para
+        # que a fila não esvazie quando a interface ou outros processos ocupam a CPU.
+        # Exige permissão (CAP_SYS_NICE ou limite rtprio); sem ela, segue com a
+        # prioridade normal
+        if hasattr(os, 'sched_setscheduler'):
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(os.sched_get_priority_min(os.SCHED_FIFO)))
+            except OSError:
+                pass
+        
+        # Usa (e fecha) apenas o arquivo desta sessão: uma nova sessão iniciada depois
+        # de stop_processing abre o seu próprio arquivo em self._sfile
+        sfile = self._sfile
         try:
-            while self.is_processing and self.audio_data is not None:
-                with self.audio_lock:
-                    # Pega um chunk do áudio
-                    chunk_end = min(self.audio_index + self.chunk_size, len(self.audio_data))
-                    audio_chunk = self.audio_data[self.audio_index:chunk_end]
-                    
-                    # Se o chunk for menor que chunk_size, preenche com zeros ou reinicia
-                    if len(audio_chunk) < self.chunk_size:
-                        padded_chunk = np.zeros(self.chunk_size, dtype=np.float32)
-                        padded_chunk[:len(audio_chunk)] = audio_chunk
-                        audio_chunk = padded_chunk
-                        # Reinicia o áudio quando chegar ao fim
-                        self.audio_index = 0
-                    else:
-                        self.audio_index = chunk_end
-                
-                # Processa o chunk com o equalizador
-                processed_chunk = self.process_chunk(audio_chunk.astype(np.float32))
-                
-                # Escreve no stream de saída
-                self.audio_stream.write(processed_chunk.tobytes())
-                
-                # Pequeno delay para evitar buffer underrun
-                time.sleep(0.001)
+            while self.is_processing:
+                # Fila cheia: espera o callback consumir um chunk. O evento é limpo
+                # antes de verificar de novo, para não perder um aviso entre os dois
+                if self._ring_head - self._ring_tail >= self._ring_chunks:
+                    self._ring_space.clear()
+                    if self._ring_head - self._ring_tail >= self._ring_chunks:
+                        self._ring_space.wait(0.1)
+                    continue
                 
+                # Escreve o próximo chunk do arquivo na próxima posição livre
+                start = (self._ring_head % self._ring_chunks) * self.chunk_size
+                np.copyto(self._file_ring[start:start + self.chunk_size], self._next_file_chunk(sfile))
+                self._ring_head += 1
         except Exception as e:
             print(f"Erro no loop de reprodução: {e}")
             self.is_processing = False
+        finally:
+            if sfile is not None:
+                sfile.close()
     
     def stop_processing(self):
         """Para o processamento em tempo real."""
@@ -345,6 +663,12 @@ class RealTimeEqualizer:
             return
         
         self.is_processing = False
+        # Acorda a thread de reprodução caso esteja esperando espaço na fila e espera
+        # que ela termine, para que uma nova sessão nunca tenha dois produtores na fila
+        self._ring_space.set()
+        if self.playback_thread is not None:
+            self.playback_thread.join(timeout=2.0)
+            self.playback_thread = None
         
         if self.audio_stream:
             self.audio_stream.stop_stream()
@@ -357,9 +681,10 @@ class RealTimeEqualizer:
     
     def restart_audio(self):
         """Reinicia a reprodução do áudio do início."""
-        if self.audio_data is not None:
-            with self.audio_lock:
-                self.audio_index = 0
+        if self.audio_file:
+            # Só a thread de reprodução altera a posição de leitura; ela atende o
+            # pedido antes de ler o próximo chunk
+            self._restart_requested = True
     
     def get_band_info(self):
         """
@@ -368,7 +693,7 @@ class RealTimeEqualizer:
         Returns:
             Lista de tuplas (frequência, ganho_db)
         """
-        return [(freq, gain) for freq, gain in 
+        return [(freq, float(gain)) for freq, gain in 
                 zip(self.center_frequencies, self.gains_db)]
     
     def get_last_processed_chunk(self):
@@ -403,6 +728,11 @@ class EqualizerGUI:
         # Variáveis para os sliders (em dB)
         self.slider_vars = []
         
+        # Ganhos alterados pelos sliders e ainda não enviados ao equalizador.
+        # Os eventos de arraste são agrupados e aplicados uma vez, quando o Tk fica ocioso
+        self._pending_updates = {}
+        self._flush_scheduled = False
+        
         # Arquivo de áudio
         self.audio_file = audio_file
         
@@ -580,8 +910,17 @@ class EqualizerGUI:
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
     
     def _on_slider_change(self, band_index, gain_db):
-        """Callback quando um slider é movido."""
-        self.equalizer.set_band_gain_db(band_index, gain_db)
+        """Callback quando um slider é movido (agrupa as mudanças até o Tk ficar ocioso)."""
+        self._pending_updates[band_index] = gain_db
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after_idle(self._flush_updates)
+    
+    def _flush_updates(self):
+        """Aplica ao equalizador os ganhos pendentes dos sliders."""
+        self._flush_scheduled = False
+        pending, self._pending_updates = self._pending_updates, {}
+        self.equalizer.set_band_gains(pending)
         # Debug: mostra os ganhos atuais
         print(f"Ganhos atualizados: {[f'{g:.1f}' for g in self.equalizer.gains_db]} dB")
     
@@ -595,9 +934,9 @@ class EqualizerGUI:
         for var in self.slider_vars:
             var.set(0.0)
         
-        # Atualiza o equalizador
-        for i in range(len(self.equalizer.center_frequencies)):
-            self.equalizer.set_band_gain_db(i, 0.0)
+        # Atualiza o equalizador (um único filtro reconstruído para as 5 bandas)
+        n_bands = len(self.equalizer.center_frequencies)
+        self.equalizer.set_band_gains(dict.fromkeys(range(n_bands), 0.0))
     
     def _load_audio_file(self):
         """Carrega um novo arquivo de áudio."""
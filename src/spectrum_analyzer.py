@@ -4,7 +4,7 @@ Implementa um analisador de espectro de barras com 10 bandas para visualização
 """
 
 import numpy as np
-from fft import fft, fftfreq
+from fft import rfft, rfftfreq, next_fast_len
 
 
 class SpectrumAnalyzer:
@@ -29,28 +29,47 @@ class SpectrumAnalyzer:
         # Usa distribuição logarítmica para melhor representação do espectro de áudio
         self.band_centers = np.logspace(np.log10(20), np.log10(nyquist), n_bands)
         
-        # Calcula as frequências de corte entre as bandas
-        self.band_edges = []
-        for i in range(n_bands):
-            if i == 0:
-                low_edge = 0
-            else:
-                low_edge = np.sqrt(self.band_centers[i-1] * self.band_centers[i])
-            
-            if i == n_bands - 1:
-                high_edge = nyquist
-            else:
-                high_edge = np.sqrt(self.band_centers[i] * self.band_centers[i+1])
-            
-            self.band_edges.append((low_edge, high_edge))
+        # Calcula as frequências de corte entre as bandas: array (n_bands, 2) com
+        # (low_edge, high_edge) de cada banda; cada linha pode ser desempacotada
+        # como uma tupla
+        self.band_edges = np.empty((n_bands, 2), dtype=np.float64)
+        
+        # Média geométrica entre cada frequência central e a seguinte: é o corte
+        # superior de uma banda e o corte inferior da próxima
+        geometric_means = np.sqrt(self.band_centers[:-1] * self.band_centers[1:])
+        
+        # Primeira banda começa em 0 Hz e a última termina em Nyquist
+        self.band_edges[0, 0] = 0.0
+        self.band_edges[1:, 0] = geometric_means
+        self.band_edges[:-1, 1] = geometric_means
+        self.band_edges[-1, 1] = nyquist
         
         # Valores atuais de cada banda (para suavização)
         self.band_levels = np.zeros(n_bands, dtype=np.float32)
         self.band_peaks = np.zeros(n_bands, dtype=np.float32)
         
+        # Visões somente leitura retornadas por analyze(): os níveis são
+        # atualizados no lugar, então não é preciso copiá-los a cada chunk
+        self._levels_view = self.band_levels.view()
+        self._levels_view.setflags(write=False)
+        self._peaks_view = self.band_peaks.view()
+        self._peaks_view.setflags(write=False)
+        
         # Parâmetros de suavização (decay para peaks)
         self.peak_decay = 0.95  # Fator de decaimento dos picos
         self.level_smoothing = 0.7  # Fator de suavização dos níveis
+        
+        # Janela de Hamming e buffers de trabalho de analyze(), por tamanho de
+        # chunk (o tamanho costuma ser constante, então são alocados uma única
+        # vez e cada chunk é processado sem novas alocações)
+        self._frame_buffers = {}
+        self._silence_thresholds = {}
+        self._new_levels = np.zeros(n_bands, dtype=np.float32)
+        self._smoothed = np.zeros(n_bands, dtype=np.float32)
+        
+        # Intervalos [início, fim) de bins da FFT de cada banda, por tamanho de FFT
+        self._bin_slices_cache = {}
+        self._reduce_cache = {}
     
     def analyze(self, audio_chunk):
         """
@@ -61,55 +80,216 @@ class SpectrumAnalyzer:
             
         Returns:
             Tupla (band_levels, band_peaks) com os níveis e picos de cada banda
+            (visões somente leitura, atualizadas pela próxima chamada)
         """
         if audio_chunk is None or len(audio_chunk) == 0:
-            return self.band_levels.copy(), self.band_peaks.copy()
+            return self._levels_view, self._peaks_view
         
-        # Calcula a FFT do chunk
+        # Aceita listas e outros array-likes (a verificação de silêncio usa max/min)
+        audio_chunk = np.asarray(audio_chunk, dtype=np.float32)
+        
+        # Calcula a FFT do chunk (preenchida com zeros até o próximo tamanho
+        # rápido da FFT, potência de 2, quando o chunk não tem esse tamanho)
         n_samples = len(audio_chunk)
-        fft_size = n_samples
+        fft_size = next_fast_len(n_samples)
+        
+        window, windowed, spectrum, squares, band_sums = self._get_frame_buffers(n_samples)
+        
+        # Chunk silencioso: nenhuma banda sairia do nível 0, então pula a FFT e
+        # apenas decai os níveis e os picos (mesmo resultado de new_levels = 0)
+        peak = max(audio_chunk.max(), -audio_chunk.min())
+        if peak < self._silence_thresholds[n_samples]:
+            self.band_levels *= self.level_smoothing
+            self.band_peaks *= self.peak_decay
+            return self._levels_view, self._peaks_view
         
         # Aplica janela de Hamming para reduzir vazamento espectral
-        windowed = audio_chunk * np.hamming(n_samples)
+        np.multiply(audio_chunk, window, out=windowed)
         
-        # Calcula FFT
-        fft_result = fft(windowed, n=fft_size)
+        # Calcula FFT (real: o sinal é real, então bastam as fft_size // 2 + 1
+        # frequências não negativas)
+        rfft(windowed, n=fft_size, out=spectrum)
         
-        # Calcula magnitude (espectro de potência)
-        magnitude = np.abs(fft_result[:fft_size // 2])
+        # Calcula o espectro de potência (re² + im², sem a raiz de np.abs): eleva
+        # ao quadrado o espectro visto como floats intercalados (re_0, im_0,
+        # re_1, ...), uma única operação sobre memória contígua
+        np.square(spectrum.view(np.float32), out=squares)
         
-        # Converte para dB (com proteção contra log(0))
-        magnitude_db = 20 * np.log10(magnitude + 1e-10)
+        # Calcula o nível de energia para cada banda: uma única redução soma
+        # todos os trechos [início, fim) (somando re² e im² de cada bin) e a
+        # multiplicação pelo inverso do tamanho dá a potência média de cada banda
+        indices, inv_band_sizes = self._band_reduce_indices(fft_size)
+        np.add.reduceat(squares, indices, out=band_sums)
+        new_levels = self._new_levels
+        np.multiply(band_sums[::2], inv_band_sizes, out=new_levels)
         
-        # Calcula as frequências correspondentes aos bins da FFT
-        freqs = fftfreq(fft_size, 1.0 / self.sample_rate)[:fft_size // 2]
+        self._power_to_levels(new_levels)
+        self._update_levels(new_levels)
         
-        # Calcula o nível de energia para cada banda
-        new_levels = np.zeros(self.n_bands, dtype=np.float32)
+        return self._levels_view, self._peaks_view
+    
+    def analyze_batch(self, chunks):
+        """
+        Analisa vários chunks de áudio de mesmo tamanho de uma vez.
+        
+        Todos os chunks passam juntos pela janela, pela FFT e pela redução por
+        banda (uma chamada de cada para o lote inteiro); a suavização e os picos
+        são atualizados chunk a chunk, na ordem, com o mesmo resultado de chamar
+        analyze() para cada linha.
         
-        for i, (low_edge, high_edge) in enumerate(self.band_edges):
-            # Encontra os bins da FFT que correspondem a esta banda
-            mask = (freqs >= low_edge) & (freqs < high_edge)
+        Args:
+            chunks: Array numpy (K, n_samples) com K chunks de áudio
             
-            if np.any(mask):
-                # Calcula a média da magnitude na banda (em dB)
-                band_magnitude = np.mean(magnitude_db[mask])
-                # Converte de dB para valor linear normalizado (0-1)
-                # Normaliza considerando que o range típico é de -80 a 0 dB
-                # Usa uma escala mais sensível para melhor visualização
-                normalized_level = np.clip((band_magnitude + 80) / 80.0, 0.0, 1.0)
-                new_levels[i] = normalized_level
-            else:
-                new_levels[i] = 0.0
+        Returns:
+            Tupla (band_levels, band_peaks) após o último chunk
+            (visões somente leitura, atualizadas pela próxima chamada)
+        """
+        chunks = np.asarray(chunks)
+        if chunks.ndim != 2:
+            raise ValueError("chunks deve ser um array 2D (K, n_samples)")
+        if chunks.size == 0:
+            return self._levels_view, self._peaks_view
+        
+        n_samples = chunks.shape[1]
+        fft_size = next_fast_len(n_samples)
+        window = self._get_frame_buffers(n_samples)[0]
+        
+        # Janela, FFT e espectro de potência de todos os chunks (um por linha)
+        windowed = np.multiply(chunks, window, dtype=np.float32)
+        squares = np.square(rfft(windowed, n=fft_size, axis=-1).view(np.float32))
         
+        # Potência média de cada banda, para cada chunk
+        indices, inv_band_sizes = self._band_reduce_indices(fft_size)
+        new_levels = np.add.reduceat(squares, indices, axis=-1)[:, ::2]
+        new_levels *= inv_band_sizes
+        
+        self._power_to_levels(new_levels)
+        for chunk_levels in new_levels:
+            self._update_levels(chunk_levels)
+        
+        return self._levels_view, self._peaks_view
+    
+    def _power_to_levels(self, levels):
+        """
+        Converte, no lugar, potências médias de banda em níveis normalizados (0-1).
+        
+        Args:
+            levels: Array float32 com as potências médias (sobrescrito com os níveis)
+        """
+        # Converte para dB (com proteção contra log(0)); 10*log10 da potência
+        # equivale a 20*log10 da magnitude.
+        # Em seguida normaliza para (0-1), considerando que o range típico é de
+        # -80 a 0 dB (escala mais sensível para melhor visualização). As duas
+        # etapas juntas, (10*log10(p) + 80) / 80, se reduzem a log10(p) / 8 + 1
+        levels += 1e-20
+        np.log10(levels, out=levels)
+        levels *= 0.125
+        levels += 1.0
+        # Bandas sem nenhum bin da FFT têm potência média 0 (-200 dB) e ficam em zero
+        np.clip(levels, 0.0, 1.0, out=levels)
+    
+    def _update_levels(self, new_levels):
+        """
+        Incorpora os níveis de um chunk aos níveis suavizados e aos picos.
+        
+        Args:
+            new_levels: Array com os níveis normalizados (0-1) do chunk
+        """
         # Suaviza os níveis para evitar flickering
-        self.band_levels = (self.level_smoothing * self.band_levels + 
-                           (1 - self.level_smoothing) * new_levels)
+        self.band_levels *= self.level_smoothing
+        np.multiply(new_levels, 1 - self.level_smoothing, out=self._smoothed)
+        self.band_levels += self._smoothed
         
         # Atualiza os picos (com decaimento)
-        self.band_peaks = np.maximum(self.band_peaks * self.peak_decay, new_levels)
+        self.band_peaks *= self.peak_decay
+        np.maximum(self.band_peaks, new_levels, out=self.band_peaks)
+    
+    def _get_frame_buffers(self, n_samples):
+        """
+        Retorna a janela e os buffers de trabalho de analyze() para chunks de
+        n_samples amostras, alocando-os na primeira chamada.
+        
+        Args:
+            n_samples: Tamanho do chunk
+            
+        Returns:
+            Tupla (window, windowed, spectrum, squares, band_sums)
+        """
+        buffers = self._frame_buffers.get(n_samples)
+        if buffers is None:
+            fft_size = next_fast_len(n_samples)
+            n_bins = fft_size // 2 + 1
+            indices = self._band_reduce_indices(fft_size)[0]
+            buffers = (
+                np.hamming(n_samples).astype(np.float32),   # janela
+                np.empty(n_samples, dtype=np.float32),      # chunk janelado
+                np.empty(n_bins, dtype=np.complex64),       # espectro
+                np.empty(2 * n_bins, dtype=np.float32),     # re² e im² intercalados
+                np.empty(len(indices), dtype=np.float32),   # somas do reduceat
+            )
+            self._frame_buffers[n_samples] = buffers
+            
+            # Nenhum bin da FFT passa de pico * soma(janela); abaixo de uma
+            # magnitude de 1e-4 (-80 dB) o nível da banda é 0. Usa metade desse
+            # limite como margem para os arredondamentos em float32
+            self._silence_thresholds[n_samples] = 0.5e-4 / float(np.sum(buffers[0]))
+        return buffers
+    
+    def _band_bin_slices(self, fft_size):
+        """
+        Retorna os intervalos de bins da FFT que pertencem a cada banda.
         
-        return self.band_levels.copy(), self.band_peaks.copy()
+        Como os bins são ordenados por frequência, cada banda ocupa um trecho
+        contíguo do espectro; os limites são calculados uma vez por fft_size.
+        
+        Args:
+            fft_size: Tamanho da FFT
+            
+        Returns:
+            Array (n_bands, 2) com os índices [início, fim) de cada banda
+        """
+        slices = self._bin_slices_cache.get(fft_size)
+        if slices is None:
+            freqs = rfftfreq(fft_size, 1.0 / self.sample_rate)
+            # Bins com low_edge <= f < high_edge
+            slices = np.searchsorted(freqs, self.band_edges, 'left').astype(np.int32)
+            self._bin_slices_cache[fft_size] = slices
+        return slices
+    
+    def _band_reduce_indices(self, fft_size):
+        """
+        Prepara os índices para somar todas as bandas com np.add.reduceat.
+        
+        Os limites são intercalados (início_0, fim_0, início_1, ...), de forma
+        que os segmentos de ordem par do reduceat são exatamente as bandas. Os
+        índices se referem ao espectro visto como floats intercalados (re, im),
+        então o bin k ocupa as posições 2k e 2k + 1.
+        
+        Args:
+            fft_size: Tamanho da FFT
+            
+        Returns:
+            Tupla (indices, inv_band_sizes): índices para o reduceat e inverso
+            do número de bins de cada banda (0 para bandas vazias, de forma que
+            a média delas é 0)
+        """
+        cached = self._reduce_cache.get(fft_size)
+        if cached is None:
+            slices = self._band_bin_slices(fft_size)
+            n_floats = 2 * (fft_size // 2 + 1)
+            indices = 2 * slices.ravel().astype(np.intp)
+            # O último segmento do reduceat já vai até o fim do espectro
+            if indices[-1] == n_floats:
+                indices = indices[:-1]
+            # Bandas vazias no topo do espectro: qualquer índice válido serve,
+            # pois o resultado é multiplicado por zero
+            indices = np.minimum(indices, n_floats - 1)
+            band_sizes = slices[:, 1] - slices[:, 0]
+            inv_band_sizes = np.zeros(len(band_sizes), dtype=np.float32)
+            np.divide(1.0, band_sizes, out=inv_band_sizes, where=band_sizes > 0)
+            cached = (indices, inv_band_sizes)
+            self._reduce_cache[fft_size] = cached
+        return cached
     
     def get_band_frequencies(self):
         """
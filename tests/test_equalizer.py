@@ -0,0 +1,45 @@
+"""
+Testes do módulo equalizer
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Os módulos de src importam uns aos outros pelo nome (from fft import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from equalizer import apply_parametric_eq, calculate_cutoff_frequencies
+
+
+@pytest.mark.parametrize('sample_rate, center_freq', [(44100, 25000), (22050, 12000),
+                                                      (44100, 22050)])
+def test_parametric_eq_rejects_center_above_nyquist(sample_rate, center_freq):
+    audio = np.random.default_rng(0).standard_normal(4096).astype(np.float32)
+    with pytest.raises(ValueError):
+        apply_parametric_eq(audio, sample_rate, center_freq, gain_db=6, q=1.0)
+
+
+def test_parametric_eq_rejects_zero_center():
+    audio = np.random.default_rng(0).standard_normal(4096).astype(np.float32)
+    with pytest.raises(ValueError):
+        apply_parametric_eq(audio, 44100, 0, gain_db=6, q=1.0)
+
+
+@pytest.mark.parametrize('n_samples', [1, 2, 5, 9])
+def test_parametric_eq_short_signal(n_samples):
+    audio = np.random.default_rng(0).standard_normal((2, n_samples)).astype(np.float32)
+    output = apply_parametric_eq(audio, 44100, 1000, gain_db=6, q=1.0)
+    assert output.shape == audio.shape
+    assert np.all(np.isfinite(output))
+
+
+def test_cutoff_frequencies_empty():
+    cutoffs = calculate_cutoff_frequencies([], 44100)
+    assert cutoffs.shape == (0, 2)
+
+
+def test_cutoff_frequencies_midpoints():
+    cutoffs = calculate_cutoff_frequencies([100, 300, 1000], 44100)
+    np.testing.assert_allclose(cutoffs, [[0, 200], [200, 650], [650, 22050]])